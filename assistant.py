@@ -0,0 +1,42 @@
+import hashlib
+import json
+from openai import NotFoundError
+
+ASSISTANT_NAME = "Recruiter Assistant"
+ASSISTANT_MODEL = "gpt-4o"
+ASSISTANT_INSTRUCTIONS = "You are a recruiter assistant. Evaluate job candidates based on their resumes and a job description. Provide a ranking, overview, pros, and cons for each candidate."
+
+def assistant_settings():
+    return {
+        "name": ASSISTANT_NAME,
+        "instructions": ASSISTANT_INSTRUCTIONS,
+        "tools": [],
+        "model": ASSISTANT_MODEL,
+    }
+
+def fingerprint(settings):
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode('utf-8')).hexdigest()
+
+def get_or_create_assistant(client, config):
+    # Reuses the assistant whose ID is cached in config when it still exists and
+    # was created from the same settings. Otherwise creates a new one, deletes
+    # the stale one and updates config in place; the caller persists config.
+    settings = assistant_settings()
+    settings_hash = fingerprint(settings)
+    cached_id = config.get('assistant_id')
+
+    if cached_id and config.get('assistant_fingerprint') == settings_hash:
+        try:
+            return client.beta.assistants.retrieve(cached_id)
+        except NotFoundError:
+            pass
+
+    assistant = client.beta.assistants.create(**settings)
+    if cached_id:
+        try:
+            client.beta.assistants.delete(cached_id)
+        except NotFoundError:
+            pass
+    config['assistant_id'] = assistant.id
+    config['assistant_fingerprint'] = settings_hash
+    return assistant
@@ -0,0 +1,127 @@
+import asyncio
+import time
+from collections import deque
+import numpy as np
+from embeddings import encode_batched
+
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_WAIT_MS = 10
+LATENCY_WINDOW = 10000
+
+class EmbeddingBatcher:
+    # Gathers encode() calls from concurrent requests into one model call. A
+    # batch is sent once it holds max_batch_size texts or max_wait seconds after
+    # its first request arrived, whichever comes first. The model runs on
+    # `executor` so the event loop keeps accepting requests meanwhile.
+    def __init__(self, model, executor, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait=DEFAULT_MAX_WAIT_MS / 1000):
+        self.model = model
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.queue = asyncio.Queue()
+        self.task = None
+        self.batches = 0
+        self.texts = 0
+        self.requests = 0
+
+    def start(self):
+        self.task = asyncio.get_running_loop().create_task(self.run())
+        return self
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+    async def encode(self, texts):
+        if not texts:
+            return np.zeros((0, self.model.get_sentence_embedding_dimension()), dtype=np.float32)
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((list(texts), future))
+        return await future
+
+    async def next_batch(self):
+        loop = asyncio.get_running_loop()
+        batch = [await self.queue.get()]
+        size = len(batch[0][0])
+        deadline = loop.time() + self.max_wait
+        while size < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self.next_batch()
+            texts = [text for request_texts, _ in batch for text in request_texts]
+            try:
+                embeddings = await loop.run_in_executor(
+                    self.executor, encode_batched, self.model, texts, self.max_batch_size
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.batches += 1
+            self.texts += len(texts)
+            self.requests += len(batch)
+            start = 0
+            for request_texts, future in batch:
+                if not future.done():
+                    future.set_result(embeddings[start:start + len(request_texts)])
+                start += len(request_texts)
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "texts": self.texts,
+            "mean_batch_size": self.texts / self.batches if self.batches else 0.0,
+            "mean_requests_per_batch": self.requests / self.batches if self.batches else 0.0,
+            "queued": self.queue.qsize(),
+        }
+
+class LatencyStats:
+    # Per-endpoint latencies over the last `window` requests. Throughput is the
+    # number of requests in the window divided by the time it spans.
+    def __init__(self, window=LATENCY_WINDOW):
+        self.window = window
+        self.samples = {}
+        self.counts = {}
+        self.errors = {}
+        self.started = time.perf_counter()
+
+    def record(self, endpoint, seconds, ok=True):
+        samples = self.samples.setdefault(endpoint, deque(maxlen=self.window))
+        samples.append((time.perf_counter(), seconds))
+        self.counts[endpoint] = self.counts.get(endpoint, 0) + 1
+        if not ok:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def summary(self):
+        now = time.perf_counter()
+        endpoints = {}
+        for endpoint, samples in self.samples.items():
+            latencies = np.array([seconds for _, seconds in samples]) * 1000
+            span = now - samples[0][0] + samples[0][1]
+            endpoints[endpoint] = {
+                "count": self.counts[endpoint],
+                "errors": self.errors.get(endpoint, 0),
+                "p50_ms": float(np.percentile(latencies, 50)),
+                "p99_ms": float(np.percentile(latencies, 99)),
+                "max_ms": float(latencies.max()),
+                "throughput_per_sec": len(samples) / span if span > 0 else 0.0,
+            }
+        return {"uptime_sec": now - self.started, "endpoints": endpoints}
@@ -0,0 +1,389 @@
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+from extraction import ExtractionCache, read_file, read_files
+from scoring import rank
+
+# Times each hot path on a synthetic resume corpus and writes the numbers as
+# JSON so runs from different versions can be compared. Corpora are generated
+# once per scale and format under benchmark_corpus/ (same seed, same files).
+# Stages whose dependencies are missing (sentence-transformers, chromadb, Qt)
+# are recorded as skipped rather than failing the run.
+#
+#   python benchmark.py --scales 100,1000 --output benchmark_results.json
+
+CORPUS_DIR = "benchmark_corpus"
+DEFAULT_SCALES = "100,1000"
+DEFAULT_LLM_MAX = 1000
+EMBEDDING_DIMENSION = 384  # all-MiniLM-L6-v2
+SCORING_QUERIES = 20
+CHROMA_QUERIES = 20
+VECTOR_STORE_QUERIES = 50
+RECALL_K = 10
+STREAM_CHUNK_CHARS = 32
+
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn"]
+LAST_NAMES = ["Smith", "Garcia", "Chen", "Patel", "Kim", "Nguyen", "Okafor", "Silva", "Novak", "Larsen"]
+TITLES = ["Software Engineer", "Data Scientist", "Backend Developer", "DevOps Engineer", "ML Engineer",
+          "Frontend Developer", "Site Reliability Engineer", "Data Engineer"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises", "Tyrell"]
+SKILLS = ["Python", "Go", "Rust", "Java", "TypeScript", "React", "Kubernetes", "Terraform", "PostgreSQL", "Kafka",
+          "PyTorch", "TensorFlow", "Spark", "AWS", "GCP", "Docker", "Redis", "GraphQL", "Airflow", "Linux"]
+VERBS = ["Built", "Led", "Designed", "Scaled", "Migrated", "Optimized", "Automated", "Maintained"]
+OBJECTS = ["a payments platform", "the data pipeline", "an internal search service", "CI/CD for 40 services",
+           "a recommendation engine", "the customer-facing API", "observability tooling", "a feature store"]
+
+JOB_DESCRIPTION = (
+    "We are hiring a Senior Backend Engineer to build and scale our data platform. You have strong Python and "
+    "PostgreSQL skills, experience running services on Kubernetes in AWS, and you care about reliability."
+)
+
+def synthetic_resume(rng, index):
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    lines = [name, f"{rng.choice(TITLES)} | candidate{index}@example.com", "", "Experience"]
+    year = 2024
+    for _ in range(rng.randint(2, 4)):
+        length = rng.randint(1, 4)
+        lines.append(f"{rng.choice(TITLES)}, {rng.choice(COMPANIES)} ({year - length}-{year})")
+        for _ in range(rng.randint(2, 4)):
+            lines.append(f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {', '.join(rng.sample(SKILLS, 2))}.")
+        year -= length
+    lines += ["", "Skills", ", ".join(rng.sample(SKILLS, rng.randint(5, 10))), "", "Education",
+              f"BSc Computer Science, {year - 4}"]
+    return "\n".join(lines)
+
+def write_pdf(path, text):
+    import fitz
+    with fitz.open() as document:
+        page = document.new_page()
+        page.insert_textbox(fitz.Rect(50, 50, 545, 800), text, fontsize=10)
+        document.save(path)
+
+def generate_corpus(scale, fmt, seed):
+    # Returns (paths, texts). Files are only written when the directory is missing
+    # or incomplete, so repeated runs reuse the corpus.
+    directory = os.path.join(CORPUS_DIR, f"{fmt}_{scale}_{seed}")
+    rng = random.Random(seed)
+    texts = [synthetic_resume(rng, index) for index in range(scale)]
+    paths = [os.path.join(directory, f"resume_{index:06d}.{'pdf' if fmt == 'pdf' else 'txt'}") for index in range(scale)]
+    marker = os.path.join(directory, ".complete")
+    if not os.path.exists(marker):
+        os.makedirs(directory, exist_ok=True)
+        for path, text in zip(paths, texts):
+            if fmt == "pdf":
+                write_pdf(path, text)
+            else:
+                with open(path, 'w', encoding='utf-8') as file:
+                    file.write(text)
+        open(marker, 'w').close()
+    return paths, texts
+
+def record(results, stage, seconds, items, **extra):
+    results[stage] = dict({
+        "seconds": seconds,
+        "items": items,
+        "per_sec": items / seconds if seconds > 0 else None,
+    }, **extra)
+    print(f"  {stage:<24} {seconds:9.3f}s  {items:>8} items", flush=True)
+
+def skip(results, stage, reason):
+    results[stage] = {"skipped": reason}
+    print(f"  {stage:<24} skipped: {reason}", flush=True)
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    value = fn(*args, **kwargs)
+    return value, time.perf_counter() - start
+
+def fake_candidates(texts):
+    return [
+        {
+            "resume": index + 1,
+            "ranking": str(index + 1),
+            "score": float(len(text) % 101),
+            "overview": text[:300],
+            "pros": ["Relevant experience", "Strong Python"],
+            "cons": ["No Kubernetes"],
+            "file": f"resume_{index:06d}.txt",
+        }
+        for index, text in enumerate(texts)
+    ]
+
+def bench_extraction(results, paths, fmt, workers):
+    stage = "read_pdf" if fmt == "pdf" else "read_text_file"
+    _, seconds = timed(lambda: [read_file(path) for path in paths])
+    record(results, stage, seconds, len(paths))
+
+    _, seconds = timed(lambda: list(read_files(paths, workers=workers)))
+    record(results, "read_files_parallel", seconds, len(paths), workers=workers)
+
+    cache_dir = tempfile.mkdtemp(prefix="benchmark_cache_")
+    try:
+        cache = ExtractionCache(cache_dir)
+        _, seconds = timed(lambda: list(read_files(paths, workers=workers, cache=cache)))
+        record(results, "read_files_cache_cold", seconds, len(paths))
+        stats = {"hits": 0, "misses": 0}
+        _, seconds = timed(lambda: list(read_files(paths, workers=workers, cache=cache, stats=stats)))
+        record(results, "read_files_cache_warm", seconds, len(paths), hits=stats["hits"])
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+def bench_encode(results, texts, model):
+    from embeddings import encode_batched
+    if model is None:
+        skip(results, "encode", "sentence-transformers is not installed")
+        return None
+    embeddings, seconds = timed(encode_batched, model, texts)
+    record(results, "encode", seconds, len(texts))
+    return embeddings
+
+def bench_chroma(results, texts, embeddings):
+    try:
+        import chromadb  # noqa: F401
+    except ImportError:
+        skip(results, "chroma_upsert", "chromadb is not installed")
+        skip(results, "chroma_query", "chromadb is not installed")
+        return
+    from resume_store import create_client, get_collection, query_talent_pool, resume_id
+    from embeddings import upsert_in_chunks
+    path = tempfile.mkdtemp(prefix="benchmark_chroma_")
+    try:
+        collection = get_collection(create_client({"chroma_backend": "persistent", "chroma_path": path}))
+        ids = [f"{resume_id(text)}-{index}" for index, text in enumerate(texts)]
+        metadatas = [{"file": f"resume_{index:06d}"} for index in range(len(texts))]
+        _, seconds = timed(upsert_in_chunks, collection, ids, texts, embeddings, metadatas=metadatas)
+        record(results, "chroma_upsert", seconds, len(texts))
+        queries = embeddings[:CHROMA_QUERIES]
+        _, seconds = timed(lambda: [query_talent_pool(collection, query, k=50) for query in queries])
+        record(results, "chroma_query", seconds, len(queries), k=50)
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+def synthetic_embeddings(scale, seed):
+    rng = np.random.default_rng(seed)
+    embeddings = rng.standard_normal((scale, EMBEDDING_DIMENSION)).astype(np.float32)
+    return embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+def bench_scoring(results, scale, embeddings, seed):
+    if embeddings is None:
+        embeddings = synthetic_embeddings(scale, seed)
+    queries = embeddings[:SCORING_QUERIES]
+    _, seconds = timed(lambda: [rank(query, embeddings, k=50) for query in queries])
+    record(results, "scoring", seconds, len(queries), k=50, rows=len(embeddings))
+
+def bench_vector_store(results, scale, embeddings, seed):
+    # Size, write and query time of the mmap store per dtype, and how many of the
+    # exact float32 top RECALL_K it still finds. Queries are the normalised mean
+    # of two stored rows, so they are close to, but not exactly, stored vectors.
+    from vector_store import DTYPES, VectorStore, recall_at_k
+    source = "model"
+    if embeddings is None:
+        embeddings, source = synthetic_embeddings(scale, seed), "synthetic"
+    rng = np.random.default_rng(seed)
+    pairs = rng.integers(0, len(embeddings), size=(VECTOR_STORE_QUERIES, 2))
+    queries = embeddings[pairs[:, 0]] + embeddings[pairs[:, 1]]
+    queries /= np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+    ids = [f"resume-{index}" for index in range(len(embeddings))]
+    metadatas = [{"file": f"resume_{index:06d}"} for index in range(len(embeddings))]
+    for dtype in DTYPES:
+        path = tempfile.mkdtemp(prefix="benchmark_vectors_")
+        try:
+            store = VectorStore(path, dtype=dtype)
+            _, seconds = timed(store.upsert, ids, embeddings, metadatas=metadatas)
+            record(results, f"mmap_{dtype}_upsert", seconds, len(ids),
+                   bytes_per_vector=store.nbytes() / max(1, store.count()), float32_bytes_per_vector=embeddings.shape[1] * 4)
+            _, seconds = timed(lambda: [store.search(query, 50) for query in queries])
+            record(results, f"mmap_{dtype}_query", seconds, len(queries), k=50, rows=len(ids))
+            recall = recall_at_k(store, embeddings, queries, RECALL_K)
+            results[f"mmap_{dtype}_query"].update(recall_at_k=recall, recall_k=RECALL_K, embeddings=source)
+            print(f"  {'':<24} recall@{RECALL_K} vs float32: {recall:.4f}", flush=True)
+            store.close()
+        finally:
+            shutil.rmtree(path, ignore_errors=True)
+
+def bench_parsing(results, texts, recruiter):
+    from stream_parser import CandidateStreamParser
+    candidates = fake_candidates(texts)
+    text = "```json\n" + json.dumps({"candidates": candidates}) + "\n```"
+    if recruiter is None:
+        skip(results, "parse_results", "PyQt5 is not installed")
+    else:
+        parsed, seconds = timed(recruiter.UploadPage.parse_results, None, text)
+        record(results, "parse_results", seconds, len(parsed), bytes=len(text))
+
+    def stream():
+        parser = CandidateStreamParser()
+        count = 0
+        for start in range(0, len(text), STREAM_CHUNK_CHARS):
+            count += len(parser.feed(text[start:start + STREAM_CHUNK_CHARS]))
+        return count
+    count, seconds = timed(stream)
+    record(results, "stream_parser", seconds, count, bytes=len(text))
+
+def bench_job_store(results, texts):
+    from job_store import JobStore
+    directory = tempfile.mkdtemp(prefix="benchmark_jobs_")
+    try:
+        store = JobStore(os.path.join(directory, "jobs.db"), os.path.join(directory, "jobs.json"))
+        job = store.create_job("Senior Backend Engineer", "Acme Corp", JOB_DESCRIPTION)
+        candidates = [dict(candidate, resume=text) for candidate, text in zip(fake_candidates(texts), texts)]
+        _, seconds = timed(store.save_rankings, job['id'], candidates)
+        record(results, "save_rankings", seconds, len(candidates))
+        loaded, seconds = timed(store.get_rankings, job['id'])
+        record(results, "get_rankings", seconds, len(loaded))
+        store.connection.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+def bench_table(results, texts, app):
+    if app is None:
+        skip(results, "populate_table", "PyQt5 is not installed")
+        return
+    from results_table import ResultsTable
+    table = ResultsTable()
+    table.resize(1000, 800)
+    table.show()
+    candidates = fake_candidates(texts)
+
+    def populate():
+        table.set_candidates(candidates)
+        app.processEvents()
+    _, seconds = timed(populate)
+    record(results, "populate_table", seconds, len(candidates))
+    table.close()
+
+def bench_llm(results, texts, paths, recruiter, args):
+    from fake_openai import FakeOpenAIServer
+    from evaluation import new_stats, rank_candidates
+    if len(texts) > args.llm_max:
+        skip(results, "llm_assistant", f"scale above --llm-max {args.llm_max}")
+        skip(results, "llm_map_reduce", f"scale above --llm-max {args.llm_max}")
+        return
+    with FakeOpenAIServer(first_token_delay=args.fake_first_token_ms / 1000, chunk_delay=args.fake_chunk_ms / 1000) as server:
+        (candidates, errors), seconds = timed(
+            rank_candidates, JOB_DESCRIPTION, texts, "benchmark", base_url=server.url, concurrency=8
+        )
+        record(results, "llm_map_reduce", seconds, len(candidates), errors=len(errors))
+
+        if recruiter is None:
+            skip(results, "llm_assistant", "PyQt5 is not installed")
+            return
+        # The real recruiter.py assistant path: one thread, a message per resume,
+        # a streamed run parsed incrementally, then validation and merging
+        from warmup import Warmup
+        from workers import Worker
+        workdir = tempfile.mkdtemp(prefix="benchmark_app_")
+        cwd = os.getcwd()
+        try:
+            os.chdir(workdir)
+            with open(recruiter.CONFIG_FILE, 'w') as file:
+                json.dump({"openai_base_url": server.url, "evaluation_mode": "assistant"}, file)
+            window = recruiter.RecruiterApp("benchmark", Warmup())
+            window.warmup.get('assistant', timeout=30)
+            worker = Worker(lambda worker: None)
+            trace = window.instrumentation.start("benchmark")
+            (candidates, _), seconds = timed(
+                window.upload_page.evaluate_in_thread, worker, JOB_DESCRIPTION, texts, paths, [], trace, new_stats()
+            )
+            record(results, "llm_assistant", seconds, len(candidates), requests=server.requests,
+                   time_to_first_token=trace.values.get("time_to_first_token_seconds"), tokens=trace.tokens["total_tokens"])
+            window.close()
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(workdir, ignore_errors=True)
+
+def load_model():
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        return None
+    from embeddings import MODEL_NAME
+    return SentenceTransformer(MODEL_NAME)
+
+def load_qt():
+    # Returns (QApplication, recruiter module) or (None, None) without PyQt5
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PyQt5.QtWidgets import QApplication
+    except ImportError:
+        return None, None
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    import recruiter
+    return app, recruiter
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the resume ranking hot paths.")
+    parser.add_argument("--scales", default=DEFAULT_SCALES, help="comma-separated corpus sizes, e.g. 100,1000,10000,100000")
+    parser.add_argument("--formats", default="text,pdf", help="comma-separated: text, pdf")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--llm-max", type=int, default=DEFAULT_LLM_MAX,
+                        help="largest scale to run the LLM stages against the fake server")
+    parser.add_argument("--fake-first-token-ms", type=float, default=0.0, help="fake server delay before streaming")
+    parser.add_argument("--fake-chunk-ms", type=float, default=0.0, help="fake server delay between stream chunks")
+    parser.add_argument("--output", default="benchmark_results.json")
+    args = parser.parse_args()
+
+    scales = [int(scale) for scale in args.scales.split(",")]
+    formats = [fmt.strip() for fmt in args.formats.split(",")]
+    model = load_model()
+    app, recruiter = load_qt()
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "args": vars(args),
+        "results": {},
+    }
+    for scale in scales:
+        scale_results = report["results"][str(scale)] = {}
+        texts = None
+        text_paths = None
+        for fmt in formats:
+            print(f"{scale} resumes ({fmt})", flush=True)
+            (paths, texts), seconds = timed(generate_corpus, scale, fmt, args.seed)
+            if fmt == "text":
+                text_paths = paths
+            scale_results[fmt] = {"corpus_seconds": seconds}
+            bench_extraction(scale_results[fmt], paths, fmt, args.workers)
+
+        print(f"{scale} resumes (pipeline)", flush=True)
+        results = scale_results["pipeline"] = {}
+        embeddings = bench_encode(results, texts, model)
+        if embeddings is not None:
+            bench_chroma(results, texts, embeddings)
+        else:
+            skip(results, "chroma", "needs embeddings from sentence-transformers")
+        bench_scoring(results, scale, embeddings, args.seed)
+        bench_vector_store(results, scale, embeddings, args.seed)
+        bench_parsing(results, texts, recruiter)
+        bench_job_store(results, texts)
+        bench_table(results, texts, app)
+        bench_llm(results, texts, text_paths or paths, recruiter, args)
+
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=2)
+    print(f"Wrote {args.output}")
+
+if __name__ == '__main__':
+    main()
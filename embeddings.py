@@ -0,0 +1,41 @@
+import numpy as np
+from vector_store import VectorStore
+
+MODEL_NAME = 'all-MiniLM-L6-v2'
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_UPSERT_BATCH_SIZE = 1000
+
+PROGRESS_BATCHES = 16
+
+def encode_batched(model, texts, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    # One encode call over the whole corpus; rows are unit length so cosine
+    # similarity is a plain dot product. With a progress(done, total) callback the
+    # corpus is encoded in slices of PROGRESS_BATCHES batches so it can report
+    # (and be cancelled by raising) between slices.
+    if not texts:
+        return np.zeros((0, model.get_sentence_embedding_dimension()), dtype=np.float32)
+    slice_size = len(texts) if progress is None else batch_size * PROGRESS_BATCHES
+    parts = []
+    for start in range(0, len(texts), slice_size):
+        parts.append(model.encode(
+            texts[start:start + slice_size],
+            batch_size=batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        ))
+        if progress is not None:
+            progress(min(start + slice_size, len(texts)), len(texts))
+    return np.asarray(np.concatenate(parts), dtype=np.float32)
+
+def upsert_in_chunks(collection, ids, documents, embeddings, chunk_size=DEFAULT_UPSERT_BATCH_SIZE, metadatas=None):
+    # Chroma wants lists of floats; the mmap store takes the array as it is
+    as_lists = not isinstance(collection, VectorStore)
+    for start in range(0, len(ids), chunk_size):
+        end = start + chunk_size
+        collection.upsert(
+            ids=ids[start:end],
+            documents=documents[start:end],
+            embeddings=embeddings[start:end].tolist() if as_lists else embeddings[start:end],
+            metadatas=metadatas[start:end] if metadatas is not None else None,
+        )
@@ -0,0 +1,294 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from openai import AsyncOpenAI
+from assistant import ASSISTANT_INSTRUCTIONS, ASSISTANT_MODEL
+
+DEFAULT_CONCURRENCY = 8
+EVALUATION_CACHE_FILE = "evaluation_cache.db"
+DEFAULT_CACHE_ENTRIES = 100000
+DEFAULT_RETRIES = 2
+
+# Structured-output schema for one evaluation. With strict mode the API only
+# returns objects of this shape; validate_evaluation still checks every reply.
+CANDIDATE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "score": {"type": "number"},
+        "overview": {"type": "string"},
+        "pros": {"type": "array", "items": {"type": "string"}},
+        "cons": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["score", "overview", "pros", "cons"],
+    "additionalProperties": False,
+}
+
+CANDIDATE_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "candidate_evaluation", "strict": True, "schema": CANDIDATE_SCHEMA},
+}
+
+# The whole-batch assistant run returns every candidate at once, tagged with the
+# number of the resume message it refers to so missing ones can be retried
+RANKING_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "candidates": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": dict(
+                    {"resume_index": {"type": "integer"}, "ranking": {"type": "string"}},
+                    **CANDIDATE_SCHEMA["properties"],
+                ),
+                "required": ["resume_index", "ranking"] + CANDIDATE_SCHEMA["required"],
+                "additionalProperties": False,
+            },
+        },
+    },
+    "required": ["candidates"],
+    "additionalProperties": False,
+}
+
+RANKING_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "candidate_ranking", "strict": True, "schema": RANKING_SCHEMA},
+}
+
+CANDIDATE_PROMPT = """
+Job Description: {job_description}
+
+Resume: {resume}
+
+Evaluate this single candidate against the job description. Respond with a JSON object in the following format:
+
+{{
+    "score": 0-100 rating of how well the candidate fits the job,
+    "overview": "Candidate's overview",
+    "pros": ["pro", ...],
+    "cons": ["con", ...]
+}}
+"""
+
+def text_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+# Changes whenever the prompt, instructions or response schema change, which
+# invalidates every cached evaluation made with the old ones
+PROMPT_VERSION = text_hash(
+    ASSISTANT_INSTRUCTIONS + CANDIDATE_PROMPT + json.dumps(CANDIDATE_RESPONSE_FORMAT, sort_keys=True)
+)[:16]
+
+class EvaluationCache:
+    # Persistent per-candidate evaluations keyed by (job description hash, resume
+    # hash, prompt version, model). Rows carry a last-used timestamp and evict()
+    # drops the least recently used ones beyond max_entries.
+    def __init__(self, path=EVALUATION_CACHE_FILE, max_entries=DEFAULT_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS evaluations ("
+                "key TEXT PRIMARY KEY, job_hash TEXT NOT NULL, evaluation TEXT NOT NULL, last_used REAL NOT NULL)"
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS evaluations_job ON evaluations (job_hash)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS evaluations_last_used ON evaluations (last_used)")
+
+    def key(self, job_description, resume, model):
+        return f"{text_hash(job_description)}:{text_hash(resume)}:{PROMPT_VERSION}:{model}"
+
+    def get_many(self, keys, chunk_size=500):
+        # Returns {position in keys: evaluation} for the keys that are cached
+        found = {}
+        with self.lock, self.connection:
+            for start in range(0, len(keys), chunk_size):
+                chunk = list(set(keys[start:start + chunk_size]))
+                placeholders = ",".join("?" * len(chunk))
+                rows = self.connection.execute(
+                    f"SELECT key, evaluation FROM evaluations WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                found.update((key, json.loads(evaluation)) for key, evaluation in rows)
+                self.connection.execute(
+                    f"UPDATE evaluations SET last_used = ? WHERE key IN ({placeholders})", [time.time()] + chunk
+                )
+        return {position: found[key] for position, key in enumerate(keys) if key in found}
+
+    def put(self, key, evaluation):
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO evaluations (key, job_hash, evaluation, last_used) VALUES (?, ?, ?, ?)",
+                (key, key.split(":", 1)[0], json.dumps(evaluation), time.time()),
+            )
+
+    def evict(self):
+        with self.lock, self.connection:
+            self.connection.execute(
+                "DELETE FROM evaluations WHERE key IN "
+                "(SELECT key FROM evaluations ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+def new_stats():
+    # Retries: extra requests made for candidates whose reply failed validation.
+    # Invalid: replies thrown away. Wasted tokens: tokens spent on those replies.
+    # The *_tokens counts cover every reply, valid or not. Cache hits and misses
+    # count this run's evaluation cache lookups, extraction_* its resume text
+    # cache lookups.
+    return {
+        "retries": 0, "invalid": 0, "wasted_tokens": 0,
+        "prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0,
+        "cache_hits": 0, "cache_misses": 0, "extraction_hits": 0, "extraction_misses": 0,
+    }
+
+def validate_evaluation(evaluation):
+    # Raises ValueError unless evaluation matches CANDIDATE_SCHEMA; returns the
+    # fields populate_table and the cache need
+    if not isinstance(evaluation, dict):
+        raise ValueError("Evaluation is not a JSON object")
+    for field in CANDIDATE_SCHEMA["required"]:
+        if field not in evaluation:
+            raise ValueError(f"Evaluation is missing '{field}'")
+    score = evaluation["score"]
+    if isinstance(score, bool) or not isinstance(score, (int, float)):
+        raise ValueError("'score' must be a number")
+    if not isinstance(evaluation["overview"], str):
+        raise ValueError("'overview' must be a string")
+    for field in ("pros", "cons"):
+        items = evaluation[field]
+        if not isinstance(items, list) or not all(isinstance(item, str) for item in items):
+            raise ValueError(f"'{field}' must be a list of strings")
+    return {
+        "score": float(score),
+        "overview": evaluation["overview"],
+        "pros": evaluation["pros"],
+        "cons": evaluation["cons"],
+    }
+
+def parse_evaluation(text):
+    return validate_evaluation(json.loads(text))
+
+async def evaluate_candidate(client, job_description, resume, model=ASSISTANT_MODEL, max_retries=DEFAULT_RETRIES,
+                             stats=None):
+    # Only this candidate is re-requested when its reply fails validation
+    for attempt in range(max_retries + 1):
+        response = await client.chat.completions.create(
+            model=model,
+            response_format=CANDIDATE_RESPONSE_FORMAT,
+            messages=[
+                {"role": "system", "content": ASSISTANT_INSTRUCTIONS},
+                {"role": "user", "content": CANDIDATE_PROMPT.format(job_description=job_description, resume=resume)},
+            ],
+        )
+        if stats is not None and response.usage is not None:
+            stats["prompt_tokens"] += response.usage.prompt_tokens
+            stats["completion_tokens"] += response.usage.completion_tokens
+            stats["total_tokens"] += response.usage.total_tokens
+        try:
+            return parse_evaluation(response.choices[0].message.content)
+        except ValueError:
+            if stats is not None:
+                stats["invalid"] += 1
+                if response.usage is not None:
+                    stats["wasted_tokens"] += response.usage.total_tokens
+            if attempt == max_retries:
+                raise
+            if stats is not None:
+                stats["retries"] += 1
+
+async def evaluate_all(client, job_description, resumes, model=ASSISTANT_MODEL, concurrency=DEFAULT_CONCURRENCY,
+                       progress=None, cache=None, max_retries=DEFAULT_RETRIES, stats=None):
+    # Map step: one request per resume, at most `concurrency` in flight. Returns a
+    # list aligned with resumes holding either an evaluation or None, plus a dict
+    # of index -> error for the candidates that failed. Cached evaluations are
+    # reused and only the remaining pairs are sent.
+    semaphore = asyncio.Semaphore(concurrency)
+    evaluations = [None] * len(resumes)
+    errors = {}
+
+    keys = None
+    if cache is not None:
+        keys = [cache.key(job_description, resume, model) for resume in resumes]
+        found = cache.get_many(keys)
+        for index, evaluation in found.items():
+            evaluations[index] = evaluation
+        if stats is not None:
+            stats["cache_hits"] += len(found)
+            stats["cache_misses"] += len(keys) - len(found)
+
+    async def evaluate(index, resume):
+        async with semaphore:
+            try:
+                evaluation = await evaluate_candidate(client, job_description, resume, model, max_retries, stats)
+                return index, evaluation, None
+            except Exception as e:
+                return index, None, f"{type(e).__name__}: {e}"
+
+    tasks = [
+        asyncio.create_task(evaluate(index, resume))
+        for index, resume in enumerate(resumes) if evaluations[index] is None
+    ]
+    done = len(resumes) - len(tasks)
+    if progress is not None:
+        progress(done, len(resumes))
+    try:
+        for future in asyncio.as_completed(tasks):
+            index, evaluation, error = await future
+            if error is None:
+                evaluations[index] = evaluation
+                if cache is not None:
+                    cache.put(keys[index], evaluation)
+            else:
+                errors[index] = error
+            done += 1
+            if progress is not None:
+                progress(done, len(resumes))
+    finally:
+        for task in tasks:
+            task.cancel()
+    return evaluations, errors
+
+def merge_rankings(evaluations, details=None):
+    # Reduce step: order the successful evaluations by score (ties keep input
+    # order) and number them in the format populate_table expects. details is an
+    # optional list of extra fields (file name, similarity...) per input resume.
+    scored = [(index, evaluation) for index, evaluation in enumerate(evaluations) if evaluation is not None]
+    scored.sort(key=lambda item: -item[1]["score"])
+    candidates = []
+    for position, (index, evaluation) in enumerate(scored):
+        candidate = dict(evaluation, ranking=str(position + 1))
+        if details is not None:
+            candidate.update(details[index])
+        candidates.append(candidate)
+    return candidates
+
+def evaluate_resumes(job_description, resumes, api_key, base_url=None, model=ASSISTANT_MODEL,
+                     concurrency=DEFAULT_CONCURRENCY, progress=None, cache=None, max_retries=DEFAULT_RETRIES,
+                     stats=None):
+    # Synchronous entry point for worker threads. base_url lets this run against a
+    # local stand-in for the OpenAI API.
+    async def run():
+        client = AsyncOpenAI(api_key=api_key, base_url=base_url)
+        try:
+            return await evaluate_all(
+                client, job_description, resumes, model, concurrency, progress, cache, max_retries, stats
+            )
+        finally:
+            await client.close()
+
+    try:
+        return asyncio.run(run())
+    finally:
+        if cache is not None:
+            cache.evict()
+
+def rank_candidates(job_description, resumes, api_key, base_url=None, model=ASSISTANT_MODEL,
+                    concurrency=DEFAULT_CONCURRENCY, details=None, progress=None, cache=None,
+                    max_retries=DEFAULT_RETRIES, stats=None):
+    evaluations, errors = evaluate_resumes(
+        job_description, resumes, api_key, base_url, model, concurrency, progress, cache, max_retries, stats
+    )
+    return merge_rankings(evaluations, details), errors
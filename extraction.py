@@ -0,0 +1,185 @@
+import codecs
+import hashlib
+import os
+import tempfile
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
+import fitz  # PyMuPDF
+
+DEFAULT_WORKERS = os.cpu_count() or 1
+
+# Bump whenever read_file output changes so stale cache entries are never served
+EXTRACTOR_VERSION = 1
+CACHE_DIR = "extraction_cache"
+DEFAULT_CACHE_BYTES = 512 * 1024 * 1024
+TEXT_CHUNK_SIZE = 64 * 1024
+ENCODINGS = ['utf-8', 'latin1', 'utf-16', 'iso-8859-1']
+
+class ExtractionCache:
+    # Extracted text stored on disk under the hash of the file contents. Entries
+    # are touched on every hit, so evict() drops the least recently used first.
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=DEFAULT_CACHE_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, file_path, max_pages=None, max_chars=None):
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as file:
+            for block in iter(lambda: file.read(1024 * 1024), b''):
+                digest.update(block)
+        key = f"{digest.hexdigest()}-v{EXTRACTOR_VERSION}"
+        if max_pages is not None:
+            key += f"-p{max_pages}"
+        if max_chars is not None:
+            key += f"-c{max_chars}"
+        return key
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, key + ".txt")
+
+    def get(self, key):
+        path = self.path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                text = file.read()
+            os.utime(path)
+            return text
+        except FileNotFoundError:
+            return None
+
+    def put(self, key, text):
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                file.write(text)
+            os.replace(tmp_path, self.path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def evict(self):
+        entries = []
+        total = 0
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".txt"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+def read_file(file_path, max_pages=None, max_chars=None):
+    return "".join(iter_file_text(file_path, max_pages, max_chars))
+
+def read_text_file(file_path):
+    return "".join(iter_text_chunks(file_path))
+
+def read_pdf(file_path):
+    return "".join(iter_pdf_pages(file_path))
+
+def iter_file_text(file_path, max_pages=None, max_chars=None):
+    # Yields the resume text piece by piece (a page for PDFs, a fixed-size chunk for
+    # text files) and stops reading once max_pages or max_chars is reached.
+    if file_path.lower().endswith('.pdf'):
+        pieces = iter_pdf_pages(file_path, max_pages)
+    else:
+        pieces = iter_text_chunks(file_path)
+
+    if max_chars is None:
+        yield from pieces
+        return
+
+    remaining = max_chars
+    for piece in pieces:
+        if len(piece) >= remaining:
+            yield piece[:remaining]
+            pieces.close()
+            return
+        remaining -= len(piece)
+        yield piece
+
+def iter_pdf_pages(file_path, max_pages=None):
+    with fitz.open(file_path) as doc:
+        page_count = len(doc) if max_pages is None else min(len(doc), max_pages)
+        for page_num in range(page_count):
+            page = doc.load_page(page_num)
+            yield page.get_text().replace('\n', ' ')
+
+def iter_text_chunks(file_path, chunk_size=TEXT_CHUNK_SIZE):
+    encoding = detect_encoding(file_path)
+    with open(file_path, 'r', encoding=encoding) as file:
+        for chunk in iter(lambda: file.read(chunk_size), ''):
+            yield chunk.replace('\n', ' ')
+
+def detect_encoding(file_path):
+    # Validate the whole file up front so a decode error can't surface after
+    # chunks have already been handed downstream
+    for encoding in ENCODINGS:
+        decoder = codecs.getincrementaldecoder(encoding)()
+        try:
+            with open(file_path, 'rb') as file:
+                for block in iter(lambda: file.read(TEXT_CHUNK_SIZE), b''):
+                    decoder.decode(block)
+            decoder.decode(b'', final=True)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    raise ValueError(f"Unable to decode the file: {file_path}")
+
+def extract(file_path, cache=None, max_pages=None, max_chars=None):
+    # Runs inside the worker processes, so errors are returned rather than raised.
+    # Returns (text, error, cache_hit).
+    try:
+        if cache is None:
+            return read_file(file_path, max_pages, max_chars), None, False
+        key = cache.key(file_path, max_pages, max_chars)
+        text = cache.get(key)
+        if text is not None:
+            return text, None, True
+        text = read_file(file_path, max_pages, max_chars)
+        cache.put(key, text)
+        return text, None, False
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}", False
+
+def read_files(file_paths, workers=None, max_pending=None, cache=None, max_pages=None, max_chars=None, stats=None,
+               executor=None):
+    # Yields (file_path, text, error) in input order. Only max_pending files are
+    # submitted at a time so memory stays bounded regardless of batch size. A
+    # stats dict gets this call's cache hits and misses added to "hits" and "misses".
+    # Pass a long-lived ProcessPoolExecutor as executor to reuse its processes
+    # across calls; otherwise a pool is started (and shut down) for this call.
+    workers = workers or DEFAULT_WORKERS
+    max_pending = max_pending or workers * 2
+
+    def result(file_path, text, error, hit):
+        if cache is not None and error is None and stats is not None:
+            stats["hits" if hit else "misses"] += 1
+        return file_path, text, error
+
+    if workers <= 1 and executor is None:
+        for file_path in file_paths:
+            yield result(file_path, *extract(file_path, cache, max_pages, max_chars))
+    else:
+        with nullcontext(executor) if executor is not None else ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            for file_path in file_paths:
+                if len(pending) >= max_pending:
+                    done_path, future = pending.popleft()
+                    yield result(done_path, *future.result())
+                pending.append((file_path, pool.submit(extract, file_path, cache, max_pages, max_chars)))
+            while pending:
+                done_path, future = pending.popleft()
+                yield result(done_path, *future.result())
+
+    if cache is not None:
+        cache.evict()
@@ -0,0 +1,244 @@
+import hashlib
+import itertools
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# A local stand-in for the parts of the OpenAI API this repo uses: assistants,
+# threads, messages, streamed runs and chat completions. Replies are made up
+# but valid and deterministic (each resume's score comes from a hash of its
+# text), and the stream can be slowed down to look like a real model. Point
+# the app at it with "openai_base_url": server.url in config.json.
+
+RESUME_MESSAGE = re.compile(r"^Resume (\d+): ", re.S)
+
+def fake_score(text):
+    return int(hashlib.sha256(text.encode('utf-8')).hexdigest()[:8], 16) % 101
+
+def fake_evaluation(text):
+    score = fake_score(text)
+    return {
+        "score": score,
+        "overview": f"Synthetic evaluation of a {len(text)} character resume.",
+        "pros": ["Relevant experience"] if score >= 50 else [],
+        "cons": [] if score >= 50 else ["Limited relevant experience"],
+    }
+
+def count_tokens(text):
+    return max(1, len(text) // 4)
+
+class FakeOpenAIServer:
+    def __init__(self, host="127.0.0.1", port=0, first_token_delay=0.0, chunk_delay=0.0, chunk_chars=32):
+        self.first_token_delay = first_token_delay
+        self.chunk_delay = chunk_delay
+        self.chunk_chars = chunk_chars
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+        self.assistants = {}
+        self.threads = {}
+        self.requests = 0
+        self.httpd = ThreadingHTTPServer((host, port), FakeOpenAIHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.fake = self
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def new_id(self, prefix):
+        return f"{prefix}_{next(self.ids)}"
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def fake(self):
+        return self.server.fake
+
+    def do_GET(self):
+        self.route("GET")
+
+    def do_POST(self):
+        self.route("POST")
+
+    def do_DELETE(self):
+        self.route("DELETE")
+
+    def route(self, method):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length)) if length else {}
+        parts = self.path.split("?", 1)[0].strip("/").split("/")
+        if parts and parts[0] == "v1":
+            parts = parts[1:]
+        with self.fake.lock:
+            self.fake.requests += 1
+
+        if parts == ["assistants"] and method == "POST":
+            return self.create_assistant(body)
+        if len(parts) == 2 and parts[0] == "assistants":
+            return self.assistant(method, parts[1])
+        if parts == ["threads"] and method == "POST":
+            return self.create_thread()
+        if len(parts) == 3 and parts[0] == "threads" and parts[2] == "messages" and method == "POST":
+            return self.create_message(parts[1], body)
+        if len(parts) == 3 and parts[0] == "threads" and parts[2] == "runs" and method == "POST":
+            return self.run(parts[1], body)
+        if len(parts) == 5 and parts[0] == "threads" and parts[4] == "cancel" and method == "POST":
+            return self.send_json({"id": parts[3], "object": "thread.run", "thread_id": parts[1], "status": "cancelling"})
+        if parts == ["chat", "completions"] and method == "POST":
+            return self.chat_completion(body)
+        self.send_json({"error": {"message": f"No fake for {method} {self.path}", "type": "invalid_request_error"}}, 404)
+
+    def send_json(self, payload, status=200):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def create_assistant(self, body):
+        assistant = dict(body, id=self.fake.new_id("asst"), object="assistant", created_at=int(time.time()),
+                         description=None, metadata={}, tools=body.get("tools", []))
+        with self.fake.lock:
+            self.fake.assistants[assistant["id"]] = assistant
+        self.send_json(assistant)
+
+    def assistant(self, method, assistant_id):
+        with self.fake.lock:
+            assistant = self.fake.assistants.get(assistant_id)
+            if method == "DELETE" and assistant is not None:
+                del self.fake.assistants[assistant_id]
+        if assistant is None:
+            return self.send_json({"error": {"message": "No such assistant", "type": "invalid_request_error"}}, 404)
+        if method == "DELETE":
+            return self.send_json({"id": assistant_id, "object": "assistant.deleted", "deleted": True})
+        self.send_json(assistant)
+
+    def create_thread(self):
+        thread_id = self.fake.new_id("thread")
+        with self.fake.lock:
+            self.fake.threads[thread_id] = []
+        self.send_json({"id": thread_id, "object": "thread", "created_at": int(time.time()), "metadata": {}})
+
+    def create_message(self, thread_id, body):
+        content = body.get("content", "")
+        with self.fake.lock:
+            self.fake.threads.setdefault(thread_id, []).append(content)
+        self.send_json(self.message(thread_id, self.fake.new_id("msg"), "user", content, "completed"))
+
+    def message(self, thread_id, message_id, role, text, status, run_id=None, assistant_id=None):
+        return {
+            "id": message_id, "object": "thread.message", "created_at": int(time.time()), "thread_id": thread_id,
+            "role": role, "status": status, "run_id": run_id, "assistant_id": assistant_id, "attachments": [],
+            "metadata": {},
+            "content": [{"type": "text", "text": {"value": text, "annotations": []}}] if text else [],
+        }
+
+    def ranking(self, thread_id):
+        with self.fake.lock:
+            contents = list(self.fake.threads.get(thread_id, []))
+        candidates = []
+        for content in contents:
+            match = RESUME_MESSAGE.match(content)
+            if match:
+                candidates.append(dict(fake_evaluation(content[match.end():]), resume_index=int(match.group(1))))
+        candidates.sort(key=lambda candidate: -candidate["score"])
+        for position, candidate in enumerate(candidates):
+            candidate["ranking"] = str(position + 1)
+        prompt = sum(count_tokens(content) for content in contents)
+        return json.dumps({"candidates": candidates}), prompt
+
+    def run(self, thread_id, body):
+        text, prompt_tokens = self.ranking(thread_id)
+        run_id = self.fake.new_id("run")
+        message_id = self.fake.new_id("msg")
+        assistant_id = body.get("assistant_id")
+        run = {
+            "id": run_id, "object": "thread.run", "created_at": int(time.time()), "thread_id": thread_id,
+            "assistant_id": assistant_id, "status": "queued", "model": "fake", "instructions": "", "tools": [],
+            "metadata": {}, "usage": None,
+        }
+        if not body.get("stream"):
+            completed = dict(run, status="completed", usage=self.usage(prompt_tokens, count_tokens(text)))
+            with self.fake.lock:
+                self.fake.threads[thread_id].append(text)
+            return self.send_json(completed)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        try:
+            self.event("thread.run.created", run)
+            self.event("thread.run.in_progress", dict(run, status="in_progress"))
+            self.event("thread.message.created",
+                       self.message(thread_id, message_id, "assistant", "", "in_progress", run_id, assistant_id))
+            time.sleep(self.fake.first_token_delay)
+            for start in range(0, len(text), self.fake.chunk_chars):
+                if start and self.fake.chunk_delay:
+                    time.sleep(self.fake.chunk_delay)
+                self.event("thread.message.delta", {
+                    "id": message_id, "object": "thread.message.delta",
+                    "delta": {"content": [{
+                        "index": 0, "type": "text",
+                        "text": {"value": text[start:start + self.fake.chunk_chars], "annotations": []},
+                    }]},
+                })
+            self.event("thread.message.completed",
+                       self.message(thread_id, message_id, "assistant", text, "completed", run_id, assistant_id))
+            self.event("thread.run.completed",
+                       dict(run, status="completed", usage=self.usage(prompt_tokens, count_tokens(text))))
+            self.wfile.write(b"event: done\ndata: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The client cancelled the stream
+        with self.fake.lock:
+            self.fake.threads[thread_id].append(text)
+
+    def event(self, name, data):
+        self.wfile.write(f"event: {name}\ndata: {json.dumps(data)}\n\n".encode('utf-8'))
+        self.wfile.flush()
+
+    def usage(self, prompt_tokens, completion_tokens):
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+
+    def chat_completion(self, body):
+        messages = body.get("messages", [])
+        prompt = messages[-1]["content"] if messages else ""
+        resume = prompt.split("Resume: ", 1)[-1].split("\n\nEvaluate this single candidate", 1)[0]
+        content = json.dumps(fake_evaluation(resume))
+        time.sleep(self.fake.first_token_delay)
+        self.send_json({
+            "id": self.fake.new_id("chatcmpl"), "object": "chat.completion", "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": self.usage(sum(count_tokens(message["content"]) for message in messages), count_tokens(content)),
+        })
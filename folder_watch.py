@@ -0,0 +1,125 @@
+import hashlib
+import os
+import sqlite3
+import time
+
+MANIFEST_FILE = "watch_manifest.db"
+DEFAULT_POLL_INTERVAL = 2.0
+DEFAULT_DEBOUNCE = 5.0
+HASH_CHUNK_SIZE = 1024 * 1024
+# Editors, office suites and browsers write these while a file is still arriving
+IGNORED_PREFIXES = (".", "~$")
+IGNORED_SUFFIXES = (".tmp", ".part", ".crdownload", ".swp")
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def scan(directory):
+    # Yields (absolute path, mtime_ns, size) for every file under directory
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = [name for name in dirs if not name.startswith(".")]
+        for name in files:
+            if name.startswith(IGNORED_PREFIXES) or name.lower().endswith(IGNORED_SUFFIXES):
+                continue
+            path = os.path.abspath(os.path.join(root, name))
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue  # Removed between listing and stat
+            yield path, stat.st_mtime_ns, stat.st_size
+
+class Manifest:
+    # Every file seen in the watched folder with the mtime, size and content
+    # hash it had when it was last processed, kept in SQLite so a restart
+    # knows which files are already ingested without reading them again.
+    def __init__(self, path=MANIFEST_FILE):
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                "path TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, content_hash TEXT NOT NULL, "
+                "resume_id TEXT, error TEXT, processed_at REAL NOT NULL)"
+            )
+        self.files = {
+            row["path"]: dict(row)
+            for row in self.connection.execute("SELECT path, mtime_ns, size, content_hash, resume_id, error FROM files")
+        }
+
+    def record(self, entries):
+        # entries are dicts with path, mtime_ns, size, content_hash and
+        # optionally resume_id or error
+        rows = []
+        for entry in entries:
+            entry = dict({"resume_id": None, "error": None}, **entry)
+            self.files[entry["path"]] = entry
+            rows.append((
+                entry["path"], entry["mtime_ns"], entry["size"], entry["content_hash"], entry["resume_id"],
+                entry["error"], time.time(),
+            ))
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO files (path, mtime_ns, size, content_hash, resume_id, error, processed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def remove(self, paths):
+        for path in paths:
+            self.files.pop(path, None)
+        with self.connection:
+            self.connection.executemany("DELETE FROM files WHERE path = ?", [(path,) for path in paths])
+
+class FolderWatcher:
+    # Polls a directory and reports files that are new or whose content changed.
+    # A file only counts once it has stopped changing: same mtime and size as
+    # on the previous poll and last modified at least `debounce` seconds ago,
+    # so a burst of writes to one file is processed once. Unchanged mtime and
+    # size skip the file without reading it; a changed mtime with the same
+    # content hash only updates the manifest.
+    def __init__(self, directory, manifest, debounce=DEFAULT_DEBOUNCE):
+        self.directory = directory
+        self.manifest = manifest
+        self.debounce = debounce
+        self.last_seen = {}
+
+    def poll(self, require_stable=True):
+        # Returns (changed entries ready to ingest, paths that disappeared)
+        now = time.time()
+        seen = {}
+        changed = []
+        touched = []
+        for path, mtime_ns, size in scan(self.directory):
+            seen[path] = (mtime_ns, size)
+            known = self.manifest.files.get(path)
+            if known is not None and (known["mtime_ns"], known["size"]) == (mtime_ns, size):
+                continue
+            if require_stable and self.last_seen.get(path) != (mtime_ns, size):
+                continue
+            if now - mtime_ns / 1e9 < self.debounce:
+                continue
+            try:
+                content_hash = file_hash(path)
+            except OSError:
+                continue
+            entry = {"path": path, "mtime_ns": mtime_ns, "size": size, "content_hash": content_hash}
+            if known is not None and known["content_hash"] == content_hash:
+                touched.append(dict(entry, resume_id=known["resume_id"], error=known["error"]))
+            else:
+                changed.append(entry)
+
+        if touched:
+            self.manifest.record(touched)
+        # The manifest is shared by every watched folder, so only paths under this
+        # one can have been removed by this scan
+        root = os.path.join(os.path.abspath(self.directory), "")
+        removed = [path for path in self.manifest.files if path.startswith(root) and path not in seen]
+        if removed:
+            self.manifest.remove(removed)
+        self.last_seen = seen
+        return changed, removed
@@ -0,0 +1,185 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+METRIC_PREFIX = "recruiter"
+
+def usage_counts(usage):
+    # Token counts from an OpenAI usage object or a stats dict, zero when missing
+    counts = {}
+    for kind in ("prompt_tokens", "completion_tokens", "total_tokens"):
+        value = usage.get(kind) if isinstance(usage, dict) else getattr(usage, kind, None)
+        counts[kind] = value or 0
+    return counts
+
+def format_seconds(seconds):
+    return f"{seconds * 1000:.0f}ms" if seconds < 1 else f"{seconds:.1f}s"
+
+class RunTrace:
+    # Timings for one processing run: named stage spans, single observations
+    # such as time to first token, and token usage. Each update calls
+    # listener(summary) so the UI can show progress as stages finish. Spans are
+    # recorded from a worker thread and read from the GUI thread, hence the lock.
+    def __init__(self, name, listener=None):
+        self.name = name
+        self.listener = listener
+        self.started_at = time.time()
+        self.started = time.perf_counter()
+        self.spans = []
+        self.values = {}
+        self.tokens = usage_counts({})
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def span(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start, start - self.started)
+
+    def record(self, stage, seconds, offset=None):
+        with self.lock:
+            self.spans.append({
+                "stage": stage,
+                "seconds": seconds,
+                "offset": offset if offset is not None else time.perf_counter() - self.started - seconds,
+            })
+        self.notify()
+
+    def observe(self, name, value):
+        with self.lock:
+            self.values[name] = value
+        self.notify()
+
+    def add_usage(self, usage):
+        counts = usage_counts(usage)
+        with self.lock:
+            for kind, value in counts.items():
+                self.tokens[kind] += value
+        self.notify()
+
+    def notify(self):
+        if self.listener is not None:
+            self.listener(self.summary())
+
+    def stage_totals(self):
+        totals = {}
+        with self.lock:
+            for span in self.spans:
+                totals[span["stage"]] = totals.get(span["stage"], 0.0) + span["seconds"]
+        return totals
+
+    def summary(self):
+        parts = [f"{stage} {format_seconds(seconds)}" for stage, seconds in self.stage_totals().items()]
+        with self.lock:
+            if "time_to_first_token_seconds" in self.values:
+                parts.append(f"first token {format_seconds(self.values['time_to_first_token_seconds'])}")
+            if self.tokens["total_tokens"]:
+                parts.append(f"{self.tokens['total_tokens']:,} tokens")
+        return " · ".join(parts)
+
+    def to_dict(self, status):
+        with self.lock:
+            return {
+                "run": self.name,
+                "status": status,
+                "started_at": self.started_at,
+                "seconds": time.perf_counter() - self.started,
+                "spans": list(self.spans),
+                "values": dict(self.values),
+                "tokens": dict(self.tokens),
+            }
+
+class Instrumentation:
+    # Collects finished RunTraces into running totals. After each run the totals
+    # are written as a Prometheus text file (for node_exporter's textfile
+    # collector) and the run itself is appended to a JSON-lines log, when those
+    # paths are configured.
+    def __init__(self, prometheus_file=None, json_log=None):
+        self.prometheus_file = prometheus_file
+        self.json_log = json_log
+        self.lock = threading.Lock()
+        self.stages = {}
+        self.values = {}
+        self.tokens = usage_counts({})
+        self.runs = {}
+        self.last_run = None
+
+    def start(self, name, listener=None):
+        return RunTrace(name, listener)
+
+    def finish(self, trace, status="ok"):
+        run = trace.to_dict(status)
+        with self.lock:
+            for stage, seconds in trace.stage_totals().items():
+                self.add_observation(self.stages, stage, seconds)
+            for name, value in run["values"].items():
+                self.add_observation(self.values, name, value)
+            for kind, value in run["tokens"].items():
+                self.tokens[kind] += value
+            self.runs[status] = self.runs.get(status, 0) + 1
+            self.last_run = run["started_at"] + run["seconds"]
+        # Called from Qt slots, so a bad export path is returned in the run as
+        # export_error for the caller to show, never raised
+        try:
+            if self.json_log:
+                with open(self.json_log, 'a') as file:
+                    file.write(json.dumps(run) + "\n")
+            if self.prometheus_file:
+                self.write_prometheus(self.prometheus_file)
+        except OSError as e:
+            run["export_error"] = str(e)
+        return run
+
+    def add_observation(self, table, name, value):
+        entry = table.setdefault(name, {"count": 0, "sum": 0.0, "max": 0.0})
+        entry["count"] += 1
+        entry["sum"] += value
+        entry["max"] = max(entry["max"], value)
+
+    def prometheus(self):
+        lines = []
+        with self.lock:
+            lines += [
+                f"# HELP {METRIC_PREFIX}_stage_seconds Time spent in each stage of processing candidates.",
+                f"# TYPE {METRIC_PREFIX}_stage_seconds summary",
+            ]
+            for stage, entry in sorted(self.stages.items()):
+                lines.append(f'{METRIC_PREFIX}_stage_seconds_sum{{stage="{stage}"}} {entry["sum"]}')
+                lines.append(f'{METRIC_PREFIX}_stage_seconds_count{{stage="{stage}"}} {entry["count"]}')
+            lines.append(f"# TYPE {METRIC_PREFIX}_stage_seconds_max gauge")
+            for stage, entry in sorted(self.stages.items()):
+                lines.append(f'{METRIC_PREFIX}_stage_seconds_max{{stage="{stage}"}} {entry["max"]}')
+            for name, entry in sorted(self.values.items()):
+                lines.append(f"# TYPE {METRIC_PREFIX}_{name} summary")
+                lines.append(f"{METRIC_PREFIX}_{name}_sum {entry['sum']}")
+                lines.append(f"{METRIC_PREFIX}_{name}_count {entry['count']}")
+            lines += [
+                f"# HELP {METRIC_PREFIX}_tokens_total OpenAI tokens used.",
+                f"# TYPE {METRIC_PREFIX}_tokens_total counter",
+            ]
+            for kind in ("prompt", "completion", "total"):
+                lines.append(f'{METRIC_PREFIX}_tokens_total{{kind="{kind}"}} {self.tokens[kind + "_tokens"]}')
+            lines.append(f"# TYPE {METRIC_PREFIX}_runs_total counter")
+            for status, count in sorted(self.runs.items()):
+                lines.append(f'{METRIC_PREFIX}_runs_total{{status="{status}"}} {count}')
+            if self.last_run is not None:
+                lines.append(f"# TYPE {METRIC_PREFIX}_last_run_timestamp_seconds gauge")
+                lines.append(f"{METRIC_PREFIX}_last_run_timestamp_seconds {self.last_run}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        # Written to a temporary file and renamed so scrapers never see half a file
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as file:
+                file.write(self.prometheus())
+            os.replace(tmp_path, path)
+        except OSError:
+            os.unlink(tmp_path)
+            raise
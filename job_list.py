@@ -0,0 +1,56 @@
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, Qt
+
+JobRole = Qt.UserRole + 1
+
+def search_key(job):
+    return f"{job['title']}\n{job['company']}".lower()
+
+class JobListModel(QAbstractListModel):
+    # Jobs keyed by id in creation order, with a lowercased title/company key
+    # per job built once so filtering never re-reads the jobs themselves.
+    # Adding or removing a job inserts or removes just that row.
+    def __init__(self, jobs=(), parent=None):
+        super().__init__(parent)
+        self.jobs = {job['id']: job for job in jobs}
+        self.search_keys = {job_id: search_key(job) for job_id, job in self.jobs.items()}
+        self.filter_text = ""
+        self.rows = list(self.jobs)
+
+    def add_job(self, job):
+        self.jobs[job['id']] = job
+        self.search_keys[job['id']] = search_key(job)
+        if self.filter_text in self.search_keys[job['id']]:
+            self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows))
+            self.rows.append(job['id'])
+            self.endInsertRows()
+
+    def remove_job(self, job_id):
+        self.jobs.pop(job_id, None)
+        self.search_keys.pop(job_id, None)
+        if job_id in self.rows:
+            row = self.rows.index(job_id)
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self.rows[row]
+            self.endRemoveRows()
+
+    def set_filter(self, text):
+        self.beginResetModel()
+        self.filter_text = text.strip().lower()
+        self.rows = [job_id for job_id, key in self.search_keys.items() if self.filter_text in key]
+        self.endResetModel()
+
+    def job(self, row):
+        return self.jobs[self.rows[row]]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        job = self.job(index.row())
+        if role == Qt.DisplayRole:
+            return f"{job['title']} at {job['company']}"
+        if role == JobRole:
+            return job
+        return None
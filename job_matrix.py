@@ -0,0 +1,75 @@
+import numpy as np
+from embeddings import DEFAULT_BATCH_SIZE, MODEL_NAME, encode_batched
+from job_store import text_hash
+from scoring import top_k_rows
+
+DEFAULT_BLOCK_SIZE = 4096
+DEFAULT_MATCHES = 10
+
+def embed_jobs(store, model, jobs, model_name=MODEL_NAME, batch_size=DEFAULT_BATCH_SIZE):
+    # Job description embeddings are cached in the job store and only
+    # re-encoded when the description (or the model) changes. Returns the
+    # (jobs, dimension) matrix in input order and how many were encoded.
+    hashes = [text_hash(job['description']) for job in jobs]
+    cached = store.get_job_embeddings([job['id'] for job in jobs], model_name)
+    embeddings = [None] * len(jobs)
+    missing = []
+    for position, (job, description_hash) in enumerate(zip(jobs, hashes)):
+        cached_hash, blob = cached.get(job['id'], (None, None))
+        if cached_hash == description_hash:
+            embeddings[position] = np.frombuffer(blob, dtype=np.float32)
+        else:
+            missing.append(position)
+
+    if missing:
+        encoded = encode_batched(model, [jobs[position]['description'] for position in missing], batch_size=batch_size)
+        store.put_job_embeddings(model_name, [
+            (jobs[position]['id'], hashes[position], embedding.tobytes())
+            for position, embedding in zip(missing, encoded)
+        ])
+        for position, embedding in zip(missing, encoded):
+            embeddings[position] = embedding
+
+    if not jobs:
+        return np.zeros((0, model.get_sentence_embedding_dimension()), dtype=np.float32), 0
+    return np.stack(embeddings), len(missing)
+
+class MatchIndex:
+    # Best matches in both directions from the full jobs x resumes similarity
+    # matrix, which is computed block_size resumes at a time so memory stays at
+    # jobs x block_size scores however many resumes there are. Only the running
+    # top matches per job and per resume are kept.
+    def __init__(self, job_embeddings, resume_embeddings, candidates_per_job=DEFAULT_MATCHES,
+                 jobs_per_candidate=DEFAULT_MATCHES, block_size=DEFAULT_BLOCK_SIZE):
+        job_embeddings = np.asarray(job_embeddings, dtype=np.float32)
+        resume_embeddings = np.asarray(resume_embeddings, dtype=np.float32)
+        n_jobs = len(job_embeddings)
+        n_resumes = len(resume_embeddings)
+        jobs_per_candidate = min(jobs_per_candidate, n_jobs)
+
+        self.candidate_indices = np.zeros((n_jobs, 0), dtype=np.int64)
+        self.candidate_scores = np.zeros((n_jobs, 0), dtype=np.float32)
+        self.job_indices = np.zeros((n_resumes, jobs_per_candidate), dtype=np.int64)
+        self.job_scores = np.zeros((n_resumes, jobs_per_candidate), dtype=np.float32)
+
+        for start in range(0, n_resumes, block_size):
+            end = min(start + block_size, n_resumes)
+            block = job_embeddings @ resume_embeddings[start:end].T
+
+            self.job_indices[start:end], self.job_scores[start:end] = top_k_rows(block.T, jobs_per_candidate)
+
+            # Merge this block into each job's running top candidates
+            scores = np.concatenate([self.candidate_scores, block], axis=1)
+            indices = np.concatenate(
+                [self.candidate_indices, np.broadcast_to(np.arange(start, end), block.shape)], axis=1
+            )
+            keep, self.candidate_scores = top_k_rows(scores, candidates_per_job)
+            self.candidate_indices = np.take_along_axis(indices, keep, axis=1)
+
+    def candidates_for_job(self, job):
+        # [(resume index, score)] best first, job being a row of job_embeddings
+        return [(int(index), float(score)) for index, score in zip(self.candidate_indices[job], self.candidate_scores[job])]
+
+    def jobs_for_candidate(self, resume):
+        # [(job index, score)] best first, resume being a row of resume_embeddings
+        return [(int(index), float(score)) for index, score in zip(self.job_indices[resume], self.job_scores[resume])]
@@ -0,0 +1,256 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+JOBS_DB_FILE = "jobs.db"
+LEGACY_JOBS_FILE = "jobs.json"
+
+RANKING_FIELDS = ("ranking", "score", "overview", "pros", "cons", "resume")
+
+# AUTOINCREMENT so a deleted job's id is never handed to a new job while
+# something (a running worker, a stale ranking) still refers to it
+JOBS_TABLE = """
+CREATE TABLE IF NOT EXISTS {name} (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    company TEXT NOT NULL,
+    description TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+JOBS_INDEXES = """
+CREATE INDEX IF NOT EXISTS jobs_title ON jobs (title);
+CREATE INDEX IF NOT EXISTS jobs_company ON jobs (company);
+"""
+
+SCHEMA = JOBS_TABLE.format(name="jobs") + JOBS_INDEXES + """
+
+CREATE TABLE IF NOT EXISTS candidates (
+    id INTEGER PRIMARY KEY,
+    content_hash TEXT NOT NULL UNIQUE,
+    text TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS rankings (
+    job_id INTEGER NOT NULL REFERENCES jobs (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    candidate_id INTEGER REFERENCES candidates (id),
+    ranking TEXT NOT NULL,
+    score REAL,
+    overview TEXT NOT NULL,
+    pros TEXT NOT NULL,
+    cons TEXT NOT NULL,
+    extra TEXT NOT NULL,
+    PRIMARY KEY (job_id, position)
+);
+CREATE INDEX IF NOT EXISTS rankings_candidate ON rankings (candidate_id);
+
+CREATE TABLE IF NOT EXISTS job_embeddings (
+    job_id INTEGER NOT NULL REFERENCES jobs (id) ON DELETE CASCADE,
+    model TEXT NOT NULL,
+    description_hash TEXT NOT NULL,
+    embedding BLOB NOT NULL,
+    PRIMARY KEY (job_id, model)
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+def text_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+class JobStore:
+    # Jobs, their rankings and the resume texts behind them in one SQLite file.
+    # Every change is its own transaction touching only the affected rows, and
+    # WAL mode keeps a crash mid-write from corrupting earlier data. Resume text
+    # is stored once per unique resume and shared between rankings.
+    def __init__(self, path=JOBS_DB_FILE, legacy_file=LEGACY_JOBS_FILE):
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+        self.upgrade_jobs_table()
+        self.migrate(legacy_file)
+
+    def upgrade_jobs_table(self):
+        # Databases created before job ids used AUTOINCREMENT get the jobs table
+        # rebuilt, keeping every id. Foreign keys are off meanwhile so dropping
+        # the old table doesn't cascade to rankings.
+        sql = self.connection.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'jobs'").fetchone()[0]
+        if "AUTOINCREMENT" in sql.upper():
+            return
+        self.connection.execute("PRAGMA foreign_keys=OFF")
+        try:
+            self.connection.execute("BEGIN")
+            with self.connection:
+                self.connection.execute(JOBS_TABLE.format(name="jobs_upgraded"))
+                self.connection.execute(
+                    "INSERT INTO jobs_upgraded (id, title, company, description, created_at) "
+                    "SELECT id, title, company, description, created_at FROM jobs"
+                )
+                self.connection.execute("DROP TABLE jobs")
+                self.connection.execute("ALTER TABLE jobs_upgraded RENAME TO jobs")
+                for statement in JOBS_INDEXES.strip().splitlines():
+                    self.connection.execute(statement)
+        finally:
+            self.connection.execute("PRAGMA foreign_keys=ON")
+
+    def migrate(self, legacy_file):
+        # One-time import of the old jobs.json, which is renamed once imported
+        migrated = self.connection.execute("SELECT value FROM meta WHERE key = 'migrated_jobs_json'").fetchone()
+        if migrated is not None or not os.path.exists(legacy_file):
+            return
+        with open(legacy_file, 'r') as file:
+            jobs = json.load(file)
+        with self.connection:
+            for job in jobs:
+                job_id = self.insert_job(job['title'], job['company'], job.get('description', ''))
+                self.insert_rankings(job_id, [self.legacy_candidate(candidate) for candidate in job.get('rankings', [])])
+            self.connection.execute("INSERT INTO meta (key, value) VALUES ('migrated_jobs_json', ?)", (str(time.time()),))
+        os.replace(legacy_file, legacy_file + ".migrated")
+        print(f"Migrated {len(jobs)} jobs from {legacy_file}")
+
+    def list_jobs(self):
+        rows = self.connection.execute("SELECT id, title, company, description FROM jobs ORDER BY id").fetchall()
+        return [dict(row) for row in rows]
+
+    def get_job(self, job_id):
+        row = self.connection.execute(
+            "SELECT id, title, company, description FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        return dict(row) if row is not None else None
+
+    def create_job(self, title, company, description):
+        with self.connection:
+            job_id = self.insert_job(title, company, description)
+        return self.get_job(job_id)
+
+    def legacy_candidate(self, candidate):
+        # recruiter-chroma.py used to save the resume text as the overview, with
+        # empty pros and cons; move it to resume so it lands in candidates
+        if "resume" not in candidate and candidate.get("pros") == "" and candidate.get("cons") == "":
+            return dict(candidate, resume=candidate.get("overview", ""), overview="")
+        return candidate
+
+    def delete_job(self, job_id):
+        with self.connection:
+            candidate_ids = self.ranked_candidate_ids(job_id)
+            self.connection.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+            self.delete_unreferenced_candidates(candidate_ids)
+
+    def get_rankings(self, job_id):
+        rows = self.connection.execute(
+            "SELECT r.ranking, r.score, r.overview, r.pros, r.cons, r.extra, c.text AS resume "
+            "FROM rankings r LEFT JOIN candidates c ON c.id = r.candidate_id "
+            "WHERE r.job_id = ? ORDER BY r.position",
+            (job_id,),
+        ).fetchall()
+        return [self.row_to_candidate(row) for row in rows]
+
+    def save_rankings(self, job_id, candidates):
+        with self.connection:
+            candidate_ids = self.ranked_candidate_ids(job_id)
+            self.connection.execute("DELETE FROM rankings WHERE job_id = ?", (job_id,))
+            self.insert_rankings(job_id, candidates)
+            self.delete_unreferenced_candidates(candidate_ids)
+
+    def ranked_candidate_ids(self, job_id):
+        rows = self.connection.execute(
+            "SELECT DISTINCT candidate_id FROM rankings WHERE job_id = ? AND candidate_id IS NOT NULL", (job_id,)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def delete_unreferenced_candidates(self, candidate_ids, chunk_size=500):
+        # Only the candidates a job just stopped referencing are checked, each
+        # through the rankings_candidate index
+        for start in range(0, len(candidate_ids), chunk_size):
+            chunk = candidate_ids[start:start + chunk_size]
+            self.connection.execute(
+                f"DELETE FROM candidates WHERE id IN ({','.join('?' * len(chunk))}) AND NOT EXISTS "
+                "(SELECT 1 FROM rankings WHERE rankings.candidate_id = candidates.id)",
+                chunk,
+            )
+
+    def get_job_embeddings(self, job_ids, model, chunk_size=500):
+        # {job_id: (description hash, raw embedding bytes)} for the cached ones
+        found = {}
+        for start in range(0, len(job_ids), chunk_size):
+            chunk = job_ids[start:start + chunk_size]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.connection.execute(
+                f"SELECT job_id, description_hash, embedding FROM job_embeddings "
+                f"WHERE model = ? AND job_id IN ({placeholders})",
+                [model] + list(chunk),
+            ).fetchall()
+            found.update((row["job_id"], (row["description_hash"], row["embedding"])) for row in rows)
+        return found
+
+    def put_job_embeddings(self, model, rows):
+        # rows of (job_id, description hash, embedding bytes)
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO job_embeddings (job_id, model, description_hash, embedding) VALUES (?, ?, ?, ?)",
+                [(job_id, model, description_hash, embedding) for job_id, description_hash, embedding in rows],
+            )
+
+    def insert_job(self, title, company, description):
+        cursor = self.connection.execute(
+            "INSERT INTO jobs (title, company, description, created_at) VALUES (?, ?, ?, ?)",
+            (title, company, description, time.time()),
+        )
+        return cursor.lastrowid
+
+    def insert_rankings(self, job_id, candidates):
+        rows = []
+        for position, candidate in enumerate(candidates):
+            candidate_id = None
+            if candidate.get("resume"):
+                candidate_id = self.candidate_id(candidate["resume"])
+            extra = {key: value for key, value in candidate.items() if key not in RANKING_FIELDS}
+            rows.append((
+                job_id,
+                position,
+                candidate_id,
+                str(candidate.get("ranking", position + 1)),
+                candidate.get("score"),
+                candidate.get("overview", ""),
+                json.dumps(candidate.get("pros", "")),
+                json.dumps(candidate.get("cons", "")),
+                json.dumps(extra),
+            ))
+        self.connection.executemany(
+            "INSERT INTO rankings (job_id, position, candidate_id, ranking, score, overview, pros, cons, extra) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    def candidate_id(self, text):
+        content_hash = text_hash(text)
+        self.connection.execute(
+            "INSERT OR IGNORE INTO candidates (content_hash, text) VALUES (?, ?)", (content_hash, text)
+        )
+        return self.connection.execute(
+            "SELECT id FROM candidates WHERE content_hash = ?", (content_hash,)
+        ).fetchone()[0]
+
+    def row_to_candidate(self, row):
+        candidate = json.loads(row["extra"])
+        candidate.update({
+            "ranking": row["ranking"],
+            "overview": row["overview"],
+            "pros": json.loads(row["pros"]),
+            "cons": json.loads(row["cons"]),
+        })
+        if row["score"] is not None:
+            candidate["score"] = row["score"]
+        if row["resume"] is not None:
+            candidate["resume"] = row["resume"]
+        return candidate
@@ -0,0 +1,63 @@
+import time
+from embeddings import DEFAULT_BATCH_SIZE, encode_batched
+from evaluation import DEFAULT_CONCURRENCY, DEFAULT_RETRIES, rank_candidates
+from scoring import rank
+
+DEFAULT_SHORTLIST_SIZE = 25
+
+def shortlist(model, job_description, resumes, top_k=DEFAULT_SHORTLIST_SIZE, threshold=None,
+              batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    # Stage 1: cheap embedding similarity over every resume. Returns (indices,
+    # scores) of the resumes that go on to the LLM, best first. progress(done,
+    # total) is called between encode slices and may raise to cancel.
+    job_desc_embedding = encode_batched(model, [job_description])[0]
+    resume_embeddings = encode_batched(model, resumes, batch_size=batch_size, progress=progress)
+    indices, scores = rank(job_desc_embedding, resume_embeddings, k=top_k)
+    if threshold is not None:
+        keep = scores >= threshold
+        indices, scores = indices[keep], scores[keep]
+    return indices, scores
+
+def hybrid_rank(model, job_description, resumes, api_key, base_url=None, top_k=DEFAULT_SHORTLIST_SIZE,
+                threshold=None, details=None, batch_size=DEFAULT_BATCH_SIZE, concurrency=DEFAULT_CONCURRENCY,
+                cache=None, progress=None, max_retries=DEFAULT_RETRIES, stats=None):
+    # Stage 2 sends only the shortlist to the per-candidate LLM evaluation.
+    # Returns (candidates, errors keyed by index into resumes, report) where the
+    # report holds per-stage timings and how many resumes passed each stage.
+    start = time.perf_counter()
+    if progress is not None:
+        progress("Shortlisting candidates", 0, 0)
+    indices, scores = shortlist(
+        model, job_description, resumes, top_k, threshold, batch_size,
+        progress=None if progress is None else lambda done, total: progress("Shortlisting candidates", done, total),
+    )
+    shortlist_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    candidates, errors = rank_candidates(
+        job_description,
+        [resumes[index] for index in indices],
+        api_key,
+        base_url=base_url,
+        concurrency=concurrency,
+        details=[
+            dict(details[index] if details is not None else {}, similarity=float(score))
+            for index, score in zip(indices, scores)
+        ],
+        cache=cache,
+        progress=None if progress is None else lambda done, total: progress("Evaluating candidates", done, total),
+        max_retries=max_retries,
+        stats=stats,
+    )
+    evaluation_seconds = time.perf_counter() - start
+
+    report = {
+        "timings": {"shortlist": shortlist_seconds, "evaluation": evaluation_seconds},
+        "counts": {
+            "resumes": len(resumes),
+            "shortlisted": len(indices),
+            "evaluated": len(candidates),
+            "failed": len(errors),
+        },
+    }
+    return candidates, {int(indices[index]): error for index, error in errors.items()}, report
@@ -1,17 +1,28 @@
-import chromadb
-from sentence_transformers import SentenceTransformer, util
+import time
+import_started = time.perf_counter()
 import json
 import os
 import sys
-import fitz
+from datetime import datetime
+from PyQt5.QtCore import pyqtSignal
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QPushButton, QTextEdit, QFileDialog,
-    QLabel, QLineEdit, QStackedWidget, QTableWidget, QTableWidgetItem, QDialog, QFormLayout,
-    QDialogButtonBox, QHeaderView, QAbstractItemView, QHBoxLayout, QGridLayout, QInputDialog, QMessageBox
+    QLabel, QLineEdit, QComboBox, QStackedWidget, QDialog, QFormLayout,
+    QDialogButtonBox, QHBoxLayout, QListView, QAbstractItemView, QInputDialog, QMessageBox
 )
+from concurrent.futures import ProcessPoolExecutor
+from extraction import DEFAULT_WORKERS, ExtractionCache, read_file, read_files
+from embeddings import DEFAULT_BATCH_SIZE, DEFAULT_UPSERT_BATCH_SIZE, MODEL_NAME, encode_batched
+from resume_store import embed_resumes, open_collection, query_talent_pool, talent_pool_filter
+from scoring import rank
+from instrumentation import Instrumentation
+from job_store import JobStore
+from job_list import JobListModel, JobRole
+from results_table import ResultsTable
+from warmup import Warmup
+from workers import Worker
 
 CONFIG_FILE = "config.json"
-JOBS_FILE = "jobs.json"
 
 # Load and save config functions
 def load_config():
@@ -24,27 +35,46 @@ def save_config(config):
     with open(CONFIG_FILE, 'w') as file:
         json.dump(config, file)
 
-def load_jobs():
-    if os.path.exists(JOBS_FILE):
-        with open(JOBS_FILE, 'r') as file:
-            return json.load(file)
-    return []
+# Chroma and the embedding model are loaded in the background once the app starts
+warmup = Warmup()
+
+def job_label(job):
+    # The "job" metadata resumes are stored and filtered under
+    return f"{job['title']} at {job['company']}"
 
-def save_jobs(jobs):
-    with open(JOBS_FILE, 'w') as file:
-        json.dump(jobs, file)
+def load_model():
+    with warmup.timed("sentence_transformers import"):
+        from sentence_transformers import SentenceTransformer  # Pulls in torch, so keep it off the startup path
+    with warmup.timed("model load"):
+        return SentenceTransformer(MODEL_NAME)
 
-# Initialize Chroma and embedding model
-chroma_client = chromadb.Client()
-collection = chroma_client.get_or_create_collection(name="resumes")
-model = SentenceTransformer('all-MiniLM-L6-v2')
+def load_collection():
+    with warmup.timed("vector store init"):
+        return open_collection(load_config())
 
 class RecruiterApp(QMainWindow):
+    warmup_finished = pyqtSignal()
+
     def __init__(self):
         super().__init__()
         self.config = load_config()
-        self.jobs = load_jobs()
+        self.store = JobStore()
+        self.instrumentation = Instrumentation(
+            prometheus_file=self.config.get('metrics_prometheus_file'),
+            json_log=self.config.get('metrics_json_log'),
+        )
         self.initUI()
+        self.statusBar().showMessage("Loading model and vector store...")
+        self.warmup_finished.connect(self.on_warmup_finished)
+        warmup.on_ready(self.warmup_finished.emit)
+
+    def on_warmup_finished(self):
+        print("Startup timings:", warmup.timing_summary())
+        if warmup.errors:
+            self.statusBar().showMessage("Not ready: " + "; ".join(f"{name} failed to load" for name in warmup.errors))
+            return
+        self.statusBar().showMessage("Ready")
+        self.upload_page.set_ready(True)
 
     def initUI(self):
         self.setWindowTitle('Tech Recruiter Assistant')
@@ -93,7 +123,7 @@ class RecruiterApp(QMainWindow):
             color: #000000;
             font-weight: bold;
         }
-        QTableWidget {
+        QTableView {
             background-color: #ffffff;
             color: #000000;
             border: 1px solid #cccccc;
@@ -135,17 +165,35 @@ class JobPage(QWidget):
     def initUI(self):
         layout = QVBoxLayout()
 
-        self.grid_layout = QGridLayout()
-        self.grid_layout.setSpacing(10)
-
-        self.load_jobs()
+        self.search_box = QLineEdit(self)
+        self.search_box.setPlaceholderText("Search jobs by title or company")
+        layout.addWidget(self.search_box)
 
         create_job_btn = QPushButton('Create Job')
         create_job_btn.setStyleSheet('color: green')
         create_job_btn.clicked.connect(self.create_job)
         layout.addWidget(create_job_btn)
 
-        layout.addLayout(self.grid_layout)
+        self.jobs_model = JobListModel(self.parent.store.list_jobs(), self)
+        self.search_box.textChanged.connect(self.jobs_model.set_filter)
+
+        self.jobs_view = QListView(self)
+        self.jobs_view.setModel(self.jobs_model)
+        self.jobs_view.setUniformItemSizes(True)
+        self.jobs_view.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.jobs_view.doubleClicked.connect(self.open_selected_job)
+        layout.addWidget(self.jobs_view)
+
+        buttons_layout = QHBoxLayout()
+        open_btn = QPushButton("Open")
+        open_btn.clicked.connect(self.open_selected_job)
+        buttons_layout.addWidget(open_btn)
+
+        delete_btn = QPushButton('Delete Job')
+        delete_btn.setStyleSheet('color: red')
+        delete_btn.clicked.connect(self.delete_selected_job)
+        buttons_layout.addWidget(delete_btn)
+        layout.addLayout(buttons_layout)
 
         back_btn = QPushButton('Back to Home')
         back_btn.clicked.connect(self.show_home_page)
@@ -153,34 +201,9 @@ class JobPage(QWidget):
 
         self.setLayout(layout)
 
-    def load_jobs(self):
-        for i in reversed(range(self.grid_layout.count())): 
-            widgetToRemove = self.grid_layout.itemAt(i).widget()
-            self.grid_layout.removeWidget(widgetToRemove)
-            widgetToRemove.setParent(None)
-
-        for index, job in enumerate(self.parent.jobs):
-            self.add_job_card(index, job)
-
-    def add_job_card(self, index, job):
-        job_card = QWidget()
-        card_layout = QVBoxLayout()
-        
-        job_title = QLabel(f"{job['title']} at {job['company']}")
-        card_layout.addWidget(job_title)
-
-        open_btn = QPushButton("Open")
-        open_btn.clicked.connect(lambda checked, index=index: self.open_job(index))
-        card_layout.addWidget(open_btn)
-
-        delete_btn = QPushButton('Delete Job')
-        delete_btn.setStyleSheet('color: red')
-        delete_btn.clicked.connect(lambda checked, index=index: self.delete_job(index))
-        card_layout.addWidget(delete_btn)
-        
-        job_card.setLayout(card_layout)
-        job_card.setMinimumHeight(100)
-        self.grid_layout.addWidget(job_card, index // 2, index % 2)
+    def selected_job(self):
+        index = self.jobs_view.currentIndex()
+        return self.jobs_model.data(index, JobRole) if index.isValid() else None
 
     def create_job(self):
         title, ok = QInputDialog.getText(self, 'Job Title', 'Enter job title:')
@@ -189,27 +212,33 @@ class JobPage(QWidget):
             if ok and company:
                 description, ok = QInputDialog.getMultiLineText(self, 'Job Description', 'Enter job description:')
                 if ok:
-                    new_job = {
-                        "title": title,
-                        "company": company,
-                        "description": description,
-                        "rankings": []
-                    }
-                    self.parent.jobs.append(new_job)
-                    save_jobs(self.parent.jobs)
-                    self.load_jobs()
-
-    def open_job(self, index):
-        job = self.parent.jobs[index]
-        self.parent.upload_page.set_job_index(index)
+                    self.jobs_model.add_job(self.parent.store.create_job(title, company, description))
+
+    def open_selected_job(self):
+        job = self.selected_job()
+        if job is not None:
+            self.open_job(job)
+
+    def delete_selected_job(self):
+        job = self.selected_job()
+        if job is not None:
+            self.delete_job(job)
+
+    def open_job(self, job):
+        self.parent.upload_page.set_job_id(job['id'])
         self.parent.upload_page.set_job_description(job['description'])
-        self.parent.upload_page.load_rankings(job.get('rankings', []))
+        self.parent.upload_page.load_rankings(self.parent.store.get_rankings(job['id']))
         self.parent.central_widget.setCurrentWidget(self.parent.upload_page)
 
-    def delete_job(self, index):
-        del self.parent.jobs[index]
-        save_jobs(self.parent.jobs)
-        self.load_jobs()
+    def delete_job(self, job):
+        run = self.parent.upload_page.runs.pop(job['id'], None)
+        if run is not None:
+            run["worker"].cancel()
+        self.parent.store.delete_job(job['id'])
+        self.jobs_model.remove_job(job['id'])
+        # Its cancelled run no longer reports back, so unbind the upload page
+        if self.parent.upload_page.job_id == job['id']:
+            self.parent.upload_page.set_job_id(None)
 
     def show_home_page(self):
         self.parent.central_widget.setCurrentWidget(self.parent.home_page)
@@ -218,13 +247,26 @@ class UploadPage(QWidget):
     def __init__(self, parent):
         super().__init__(parent)
         self.parent = parent
-        self.job_index = None
+        self.job_id = None
+        self.ready = False
+        # The run in progress for each job id. Worker signals carry their own run,
+        # so a run that was cancelled or replaced only ever touches itself.
+        self.runs = {}
+        self.pool_worker = None
+        self.files = self.parent.config.get('files', [])
+        cache_mb = self.parent.config.get('extraction_cache_mb', 512)
+        self.extraction_cache = ExtractionCache(max_bytes=cache_mb * 1024 * 1024)
+        # One pool of extraction processes for the app, shared by every job's worker
+        workers = self.parent.config.get('ingest_workers') or DEFAULT_WORKERS
+        self.extraction_pool = ProcessPoolExecutor(max_workers=workers)
         self.initUI()
 
     def initUI(self):
         layout = QVBoxLayout()
 
         self.upload_status = QLabel("No files uploaded.")
+        if self.files:
+            self.upload_status.setText("Files uploaded: " + ", ".join([os.path.basename(file) for file in self.files]))
         layout.addWidget(self.upload_status)
 
         self.upload_btn = QPushButton('Upload Resumes', self)
@@ -238,16 +280,34 @@ class UploadPage(QWidget):
 
         self.process_btn = QPushButton('Process Candidates', self)
         self.process_btn.clicked.connect(self.process_candidates)
+        self.process_btn.setEnabled(False)
         layout.addWidget(self.process_btn)
 
+        self.cancel_btn = QPushButton('Cancel Processing', self)
+        self.cancel_btn.clicked.connect(self.cancel_processing)
+        self.cancel_btn.setEnabled(False)
+        layout.addWidget(self.cancel_btn)
+
+        pool_layout = QHBoxLayout()
+        # Editable so resumes tagged by recruiter-service.py or the watcher can be
+        # picked too, but prefilled with the jobs resumes are uploaded under here
+        self.pool_job_filter = QComboBox(self)
+        self.pool_job_filter.setEditable(True)
+        self.pool_job_filter.lineEdit().setPlaceholderText("Source job (optional)")
+        pool_layout.addWidget(self.pool_job_filter)
+        self.pool_since_filter = QLineEdit(self)
+        self.pool_since_filter.setPlaceholderText("Ingested since YYYY-MM-DD (optional)")
+        pool_layout.addWidget(self.pool_since_filter)
+        self.search_pool_btn = QPushButton('Search Talent Pool', self)
+        self.search_pool_btn.clicked.connect(self.search_talent_pool)
+        self.search_pool_btn.setEnabled(False)
+        pool_layout.addWidget(self.search_pool_btn)
+        layout.addLayout(pool_layout)
+
         self.processing_label = QLabel("")
         layout.addWidget(self.processing_label)
 
-        self.results_table = QTableWidget(self)
-        self.results_table.setColumnCount(4)
-        self.results_table.setHorizontalHeaderLabels(["Ranking", "Overview", "Pros", "Cons"])
-        self.results_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.results_table.setSelectionMode(QAbstractItemView.NoSelection)
+        self.results_table = ResultsTable(self)
         layout.addWidget(self.results_table)
 
         back_btn = QPushButton('Back to Jobs')
@@ -256,8 +316,27 @@ class UploadPage(QWidget):
 
         self.setLayout(layout)
 
-    def set_job_index(self, index):
-        self.job_index = index
+    def set_ready(self, ready):
+        self.ready = ready
+        self.update_buttons()
+
+    def update_buttons(self):
+        running = self.job_id in self.runs
+        self.process_btn.setEnabled(self.ready and not running)
+        self.cancel_btn.setEnabled(running)
+        self.search_pool_btn.setEnabled(self.ready and self.pool_worker is None)
+
+    def set_job_id(self, job_id):
+        self.job_id = job_id
+        self.processing_label.setText("Processing..." if job_id in self.runs else "")
+        self.refresh_pool_jobs()
+        self.update_buttons()
+
+    def refresh_pool_jobs(self):
+        current = self.pool_job_filter.currentText()
+        self.pool_job_filter.clear()
+        self.pool_job_filter.addItems([""] + sorted({job_label(job) for job in self.parent.store.list_jobs()}))
+        self.pool_job_filter.setCurrentText(current)
 
     def set_job_description(self, description):
         self.job_desc.setText(description)
@@ -276,90 +355,255 @@ class UploadPage(QWidget):
         self.parent.config['job_description'] = job_description
         save_config(self.parent.config)
 
-        resumes = [self.read_file(file) for file in self.files]
+        # Each job gets its own worker, so several jobs can be processed at once
+        trace = self.parent.instrumentation.start(f"job {self.job_id}")
+        worker = Worker(self.rank_candidates, job_description, list(self.files), self.job_metadata(), trace)
+        trace.listener = worker.signals.metrics.emit
+        run = {"job_id": self.job_id, "worker": worker, "trace": trace}
+        worker.signals.progress.connect(lambda stage, done, total, run=run: self.on_progress(run, stage, done, total))
+        worker.signals.metrics.connect(lambda summary, run=run: self.on_metrics(run, summary))
+        worker.signals.finished.connect(lambda result, run=run: self.on_finished(run, result))
+        worker.signals.failed.connect(lambda error, run=run: self.on_stopped(run, "Processing failed: " + error, "failed"))
+        worker.signals.cancelled.connect(lambda run=run: self.on_stopped(run, "Processing cancelled.", "cancelled"))
+        self.runs[self.job_id] = run
+        worker.start()
 
         self.processing_label.setText("Processing...")
-
-        # Embed job description
-        job_desc_embedding = model.encode(job_description).tolist()
-
-        # Store resume embeddings in Chroma
-        resume_embeddings = []
-        for i, resume in enumerate(resumes):
-            embedding = model.encode(resume).tolist()  # Convert to list
-            resume_embeddings.append(embedding)
-            collection.upsert(documents=[resume], embeddings=[embedding], ids=[str(i)])  # Add unique IDs
-
-        # Compute similarity scores
-        similarities = []
-        for embedding in resume_embeddings:
-            similarity = util.pytorch_cos_sim(job_desc_embedding, embedding).item()
-            similarities.append(similarity)
-
-        # Rank candidates based on similarity scores
-        ranked_candidates = sorted(
-            [(resumes[i], similarities[i]) for i in range(len(resumes))],
-            key=lambda x: x[1],
-            reverse=True
+        self.update_buttons()
+
+    def cancel_processing(self):
+        run = self.runs.get(self.job_id)
+        if run is not None:
+            run["worker"].cancel()
+            self.processing_label.setText("Cancelling...")
+
+    def is_shown(self, run):
+        # Only the current run of the job on screen updates the page
+        return run["job_id"] == self.job_id and self.runs.get(self.job_id) is run
+
+    def end_run(self, run):
+        if self.runs.get(run["job_id"]) is run:
+            del self.runs[run["job_id"]]
+
+    def on_progress(self, run, stage, done, total):
+        if self.is_shown(run):
+            self.processing_label.setText(f"{stage}... {done}/{total}" if total else f"{stage}...")
+
+    def on_metrics(self, run, summary):
+        if self.is_shown(run):
+            self.parent.statusBar().showMessage(summary)
+
+    def on_finished(self, run, result):
+        candidates, message = result
+        shown = self.is_shown(run)
+        self.end_run(run)
+        try:
+            with run["trace"].span("save"):
+                self.save_rankings(candidates, run["job_id"])
+        finally:
+            self.finish_trace(run, "ok", shown)
+        if shown:
+            self.processing_label.setText(message)
+            self.populate_table(candidates)
+        self.update_buttons()
+
+    def on_stopped(self, run, message, status):
+        shown = self.is_shown(run)
+        self.end_run(run)
+        self.finish_trace(run, status, shown)
+        if shown:
+            self.processing_label.setText(message)
+        self.update_buttons()
+
+    def finish_trace(self, run, status, shown):
+        trace = run["trace"]
+        finished = self.parent.instrumentation.finish(trace, status)
+        if shown:
+            message = f"Last run ({status}): {trace.summary()}"
+            if "export_error" in finished:
+                message += f" (metrics not exported: {finished['export_error']})"
+            self.parent.statusBar().showMessage(message)
+
+    def rank_candidates(self, worker, job_description, files, job_metadata, trace):
+        # Runs on the thread pool: no widget access in here. Stages are timed on trace.
+        config = self.parent.config
+        cache_stats = {"hits": 0, "misses": 0}
+        with trace.span("read_resumes"):
+            resumes, resume_files, failed = self.read_files(files, worker, cache_stats)
+
+        worker.report("Loading model")
+        with trace.span("load_model"):
+            model = warmup.get('model')
+            collection = warmup.get('collection')
+
+        # Embed job description and any resumes not already in the store
+        worker.report("Embedding resumes")
+        start = time.perf_counter()
+        with trace.span("encode_job"):
+            job_desc_embedding = encode_batched(model, [job_description])[0]
+        timings = {}
+        _, resume_embeddings, embedded = embed_resumes(
+            collection,
+            model,
+            resumes,
+            [dict(job_metadata, file=os.path.basename(file_path)) for file_path in resume_files],
+            batch_size=config.get('embed_batch_size', DEFAULT_BATCH_SIZE),
+            upsert_batch_size=config.get('upsert_batch_size', DEFAULT_UPSERT_BATCH_SIZE),
+            progress=lambda done, total: worker.report("Embedding resumes", done, total),
+            timings=timings,
         )
-
-        self.processing_label.setText("Processing complete.")
-        self.format_results(ranked_candidates)
-
-
-    def format_results(self, ranked_candidates):
+        for step, stage in (("lookup", "store_lookup"), ("encode", "encode"), ("upsert", "store_upsert")):
+            if step in timings:
+                trace.record(stage, timings[step])
+        elapsed = time.perf_counter() - start
+        throughput = embedded / elapsed if elapsed > 0 else 0.0
+        print(f"Embedded and stored {embedded} new resumes in {elapsed:.2f}s ({throughput:.1f} resumes/sec)")
+
+        # Score all resumes at once and keep the best top_k (all of them by default)
+        worker.report("Scoring candidates")
+        with trace.span("score"):
+            ranked_indices, scores = rank(job_desc_embedding, resume_embeddings, k=config.get('top_k'))
+
+        message = (
+            self.completion_message(failed, cache_stats)
+            + f" Embedded {embedded} new resumes at {throughput:.1f} resumes/sec, {len(resumes) - embedded} already stored."
+        )
+        return self.format_results(resumes, resume_files, ranked_indices, scores), message
+
+    def search_talent_pool(self):
+        since = self.pool_since_filter.text().strip()
+        try:
+            ingested_after = int(datetime.strptime(since, "%Y-%m-%d").timestamp()) if since else None
+        except ValueError:
+            QMessageBox.warning(self, "Invalid Date", "Enter the date as YYYY-MM-DD.")
+            return
+
+        job_id = self.job_id
+        worker = Worker(
+            self.find_pool_matches,
+            self.job_desc.toPlainText(),
+            self.parent.config.get('talent_pool_top_k', 50),
+            self.pool_job_filter.currentText().strip(),
+            ingested_after,
+        )
+        worker.signals.finished.connect(lambda result, job_id=job_id: self.on_pool_results(job_id, result))
+        worker.signals.failed.connect(
+            lambda error, job_id=job_id: self.on_pool_results(job_id, ([], "Talent pool search failed: " + error))
+        )
+        self.pool_worker = worker.start()
+        self.processing_label.setText("Searching talent pool...")
+        self.update_buttons()
+
+    def find_pool_matches(self, worker, job_description, k, job, ingested_after):
+        # Runs on the thread pool: no widget access in here
+        model = warmup.get('model')
+        collection = warmup.get('collection')
+        start = time.perf_counter()
+        job_desc_embedding = encode_batched(model, [job_description])[0]
+        where = talent_pool_filter(job=job, ingested_after=ingested_after)
+        matches = query_talent_pool(collection, job_desc_embedding, k=k, where=where)
+        elapsed = time.perf_counter() - start
         candidates = [
-            {"ranking": str(i + 1), "overview": ranked_candidates[i][0], "pros": "", "cons": ""}
-            for i in range(len(ranked_candidates))
+            {
+                "ranking": str(position + 1),
+                "score": match["score"],
+                "overview": "",
+                "pros": "",
+                "cons": "",
+                "resume": match["document"],
+                "file": match["metadata"].get("file", ""),
+            }
+            for position, match in enumerate(matches)
+        ]
+        message = f"Found {len(matches)} candidates in the talent pool in {elapsed * 1000:.0f} ms."
+        if not matches and job:
+            # Job names match exactly, so say which one found nothing
+            message += f" No stored resumes were uploaded for \"{job}\"."
+        return candidates, message
+
+    def on_pool_results(self, job_id, result):
+        # Search results are only shown, never saved, so the job's processed
+        # ranking is still there the next time it is opened
+        candidates, message = result
+        self.pool_worker = None
+        if job_id == self.job_id:
+            self.processing_label.setText(message)
+            if candidates:
+                self.populate_table(candidates)
+        self.update_buttons()
+
+    def job_metadata(self):
+        if self.job_id is None:
+            return {}
+        return {"job": job_label(self.parent.store.get_job(self.job_id))}
+
+    def format_results(self, resumes, resume_files, ranked_indices, scores):
+        # The resume text goes under "resume" so the job store keeps one copy of it
+        return [
+            {
+                "ranking": str(position + 1),
+                "score": float(score),
+                "overview": "",
+                "pros": "",
+                "cons": "",
+                "resume": resumes[index],
+                "file": os.path.basename(resume_files[index]),
+            }
+            for position, (index, score) in enumerate(zip(ranked_indices, scores))
         ]
-        self.populate_table(candidates)
-        self.save_rankings(candidates)
 
     def populate_table(self, candidates):
-        self.results_table.setRowCount(len(candidates))
-        for row, candidate in enumerate(candidates):
-            self.results_table.setItem(row, 0, QTableWidgetItem(candidate["ranking"]))
-            self.results_table.setItem(row, 1, QTableWidgetItem(candidate["overview"]))
-            self.results_table.setItem(row, 2, QTableWidgetItem(candidate["pros"]))
-            self.results_table.setItem(row, 3, QTableWidgetItem(candidate["cons"]))
-        self.results_table.resizeRowsToContents()  # Adjust row heights
-
-    def save_rankings(self, candidates):
-        if self.job_index is not None:
-            self.parent.jobs[self.job_index]['rankings'] = candidates
-            save_jobs(self.parent.jobs)
+        self.results_table.set_candidates(candidates)
+
+    def save_rankings(self, candidates, job_id):
+        # The job may have been deleted while its worker was still running
+        if job_id is not None and self.parent.store.get_job(job_id) is not None:
+            self.parent.store.save_rankings(job_id, candidates)
 
     def load_rankings(self, rankings):
         self.populate_table(rankings)
 
+    def completion_message(self, failed_files, cache_stats):
+        message = "Processing complete."
+        if failed_files:
+            message += f" Skipped {len(failed_files)} unreadable file(s): " + ", ".join(failed_files)
+        message += f" (extraction cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses)"
+        return message
+
     def read_file(self, file_path):
-        if file_path.lower().endswith('.pdf'):
-            return self.read_pdf(file_path)
-        else:
-            return self.read_text_file(file_path)
-
-    def read_text_file(self, file_path):
-        encodings = ['utf-8', 'latin1', 'utf-16', 'iso-8859-1']
-        for encoding in encodings:
-            try:
-                with open(file_path, 'r', encoding=encoding) as file:
-                    return file.read().replace('\n', ' ')
-            except (UnicodeDecodeError, FileNotFoundError):
-                continue
-        raise UnicodeDecodeError(f"Unable to decode the file: {file_path}")
-
-    def read_pdf(self, file_path):
-        doc = fitz.open(file_path)
-        text = ""
-        for page_num in range(len(doc)):
-            page = doc.load_page(page_num)
-            text += page.get_text().replace('\n', ' ')
-        return text
+        return read_file(file_path)
+
+    def read_files(self, files, worker=None, cache_stats=None):
+        # Every resume's text is kept for ranking; only the files being extracted
+        # at once are bounded, by read_files' max_pending
+        resumes = []
+        resume_files = []
+        failed = []
+        config = self.parent.config
+        for file_path, text, error in read_files(
+            files,
+            workers=config.get('ingest_workers'),
+            cache=self.extraction_cache,
+            max_pages=config.get('max_resume_pages'),
+            max_chars=config.get('max_resume_chars'),
+            stats=cache_stats,
+            executor=self.extraction_pool,
+        ):
+            if worker is not None:
+                worker.report("Reading resumes", len(resumes) + len(failed) + 1, len(files))
+            if error is None:
+                resumes.append(text)
+                resume_files.append(file_path)
+            else:
+                failed.append(f"{os.path.basename(file_path)} ({error})")
+        return resumes, resume_files, failed
 
     def show_job_page(self):
         self.parent.central_widget.setCurrentWidget(self.parent.job_page)
 
 if __name__ == '__main__':
+    warmup.timings["imports"] = time.perf_counter() - import_started
+    warmup.add('model', load_model).add('collection', load_collection).start()
     app = QApplication(sys.argv)
 
     ex = RecruiterApp()
@@ -0,0 +1,277 @@
+import argparse
+import json
+import os
+import sys
+import time
+from extraction import ExtractionCache, read_files
+from embeddings import DEFAULT_BATCH_SIZE, DEFAULT_UPSERT_BATCH_SIZE, MODEL_NAME, encode_batched
+from evaluation import (
+    DEFAULT_CACHE_ENTRIES, DEFAULT_CONCURRENCY, DEFAULT_RETRIES, EvaluationCache, new_stats, rank_candidates
+)
+from job_matrix import DEFAULT_BLOCK_SIZE, DEFAULT_MATCHES, MatchIndex, embed_jobs
+from job_store import JobStore
+from pipeline import DEFAULT_SHORTLIST_SIZE, hybrid_rank
+from scoring import rank
+
+# Runs the same ranking pipelines as recruiter.py and recruiter-chroma.py
+# without Qt, for servers and cron jobs. Ranked candidates go to stdout (or
+# --output) as one JSON object per line; progress and errors go to stderr.
+
+CONFIG_FILE = "config.json"
+MODES = ["map_reduce", "hybrid", "embedding"]
+
+EXIT_OK = 0
+EXIT_FAILED = 1  # nothing could be ranked
+EXIT_USAGE = 2  # bad arguments, same code argparse uses
+EXIT_PARTIAL = 3  # ranked, but some resumes could not be read or evaluated
+
+def load_config():
+    if os.path.exists(CONFIG_FILE):
+        with open(CONFIG_FILE, 'r') as file:
+            return json.load(file)
+    return {}
+
+def load_model():
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(MODEL_NAME)
+
+def log(message):
+    print(message, file=sys.stderr, flush=True)
+
+def progress(stage, done=0, total=0):
+    log(f"{stage}... {done}/{total}" if total else f"{stage}...")
+
+def parse_args(config):
+    parser = argparse.ArgumentParser(description="Rank a directory of resumes against a job without the GUI.")
+    job = parser.add_mutually_exclusive_group(required=True)
+    job.add_argument("--job-id", type=int, help="ID of a job saved in the app")
+    job.add_argument("--job-file", help="file containing the job description")
+    job.add_argument("--all-jobs", action="store_true",
+                     help="match every resume against every saved job by similarity (ignores --mode)")
+    parser.add_argument("resume_dir", help="directory of resume files (.pdf or text)")
+    mode = config.get('evaluation_mode')
+    parser.add_argument("--mode", choices=MODES, default=mode if mode in MODES else "map_reduce",
+                        help="map_reduce: LLM per resume; hybrid: embedding shortlist then LLM; embedding: similarity only")
+    parser.add_argument("--workers", type=int, default=config.get('ingest_workers'),
+                        help="processes used to extract resume text (default: CPU count)")
+    parser.add_argument("--concurrency", type=int, default=config.get('evaluation_concurrency', DEFAULT_CONCURRENCY),
+                        help="LLM requests in flight at once")
+    parser.add_argument("--top-k", type=int,
+                        help=f"only output the best K candidates (with --all-jobs, matches per side, default {DEFAULT_MATCHES})")
+    parser.add_argument("--output", help="write JSONL here instead of stdout")
+    parser.add_argument("--save", action="store_true", help="store the ranking on the job given by --job-id")
+    parser.add_argument("--include-text", action="store_true", help="include the resume text in each line")
+    return parser.parse_args()
+
+def job_description(args, store):
+    if args.job_id is not None:
+        job = store.get_job(args.job_id)
+        if job is None:
+            raise LookupError(f"No job with ID {args.job_id}")
+        return job['description']
+    with open(args.job_file, 'r', encoding='utf-8') as file:
+        return file.read()
+
+def resume_paths(resume_dir):
+    return sorted(entry.path for entry in os.scandir(resume_dir) if entry.is_file())
+
+def read_resumes(files, config, workers):
+    resumes = []
+    resume_files = []
+    failed = []
+    for file_path, text, error in read_files(
+        files,
+        workers=workers,
+        cache=ExtractionCache(max_bytes=config.get('extraction_cache_mb', 512) * 1024 * 1024),
+        max_pages=config.get('max_resume_pages'),
+        max_chars=config.get('max_resume_chars'),
+    ):
+        if error is None:
+            resumes.append(text)
+            resume_files.append(file_path)
+        else:
+            log(f"Error reading {file_path}: {error}")
+            failed.append(file_path)
+    return resumes, resume_files, failed
+
+def embed_and_store(config, model, resumes, resume_files):
+    # Same as recruiter-chroma.py: embeddings are stored in the vector store so
+    # later runs and talent pool searches reuse them
+    from resume_store import embed_resumes, open_collection
+    collection = open_collection(config)
+    _, resume_embeddings, embedded = embed_resumes(
+        collection,
+        model,
+        resumes,
+        [{"file": os.path.basename(file_path)} for file_path in resume_files],
+        batch_size=config.get('embed_batch_size', DEFAULT_BATCH_SIZE),
+        upsert_batch_size=config.get('upsert_batch_size', DEFAULT_UPSERT_BATCH_SIZE),
+        progress=lambda done, total: progress("Embedding resumes", done, total),
+    )
+    log(f"Embedded {embedded} new resumes, {len(resumes) - embedded} already stored")
+    return resume_embeddings
+
+def rank_by_embedding(config, description, resumes, resume_files, top_k):
+    progress("Loading model")
+    model = load_model()
+    job_desc_embedding = encode_batched(model, [description])[0]
+    resume_embeddings = embed_and_store(config, model, resumes, resume_files)
+    ranked_indices, scores = rank(job_desc_embedding, resume_embeddings, k=top_k)
+    candidates = [
+        {
+            "ranking": str(position + 1),
+            "score": float(score),
+            "overview": "",
+            "pros": "",
+            "cons": "",
+            "resume": resumes[index],
+            "file": os.path.basename(resume_files[index]),
+        }
+        for position, (index, score) in enumerate(zip(ranked_indices, scores))
+    ]
+    return candidates, {}
+
+def rank_by_llm(args, config, description, resumes, resume_files, api_key):
+    labels = [os.path.basename(file_path) for file_path in resume_files]
+    cache = EvaluationCache(max_entries=config.get('evaluation_cache_entries', DEFAULT_CACHE_ENTRIES))
+    stats = new_stats()
+    if args.mode == 'hybrid':
+        candidates, errors, report = hybrid_rank(
+            load_model(),
+            description,
+            resumes,
+            api_key,
+            base_url=config.get('openai_base_url'),
+            top_k=config.get('shortlist_top_k', DEFAULT_SHORTLIST_SIZE),
+            threshold=config.get('shortlist_threshold'),
+            details=[{"file": label} for label in labels],
+            batch_size=config.get('embed_batch_size', DEFAULT_BATCH_SIZE),
+            concurrency=args.concurrency,
+            cache=cache,
+            progress=progress,
+            max_retries=config.get('evaluation_retries', DEFAULT_RETRIES),
+            stats=stats,
+        )
+        log(f"Hybrid pipeline: {report}")
+    else:
+        candidates, errors = rank_candidates(
+            description,
+            resumes,
+            api_key,
+            base_url=config.get('openai_base_url'),
+            concurrency=args.concurrency,
+            details=[{"file": label} for label in labels],
+            progress=lambda done, total: progress("Evaluating candidates", done, total),
+            cache=cache,
+            max_retries=config.get('evaluation_retries', DEFAULT_RETRIES),
+            stats=stats,
+        )
+    log(f"Evaluation cache: {stats['cache_hits']} hits, {stats['cache_misses']} misses; "
+        f"{stats['retries']} retries, {stats['invalid']} invalid replies, {stats['total_tokens']} tokens")
+    for index, error in errors.items():
+        log(f"Error evaluating {resume_files[index]}: {error}")
+    if args.top_k is not None:
+        candidates = candidates[:args.top_k]
+    return candidates, errors
+
+def match_all_jobs(config, store, resumes, resume_files, top_k):
+    # Routes every resume to its best jobs and every job to its best resumes
+    # from one blocked jobs x resumes similarity matrix
+    jobs = store.list_jobs()
+    if not jobs:
+        raise LookupError("No saved jobs to match against")
+    progress("Loading model")
+    model = load_model()
+    batch_size = config.get('embed_batch_size', DEFAULT_BATCH_SIZE)
+    job_embeddings, encoded = embed_jobs(store, model, jobs, batch_size=batch_size)
+    log(f"Embedded {encoded} job descriptions, {len(jobs) - encoded} cached")
+    resume_embeddings = embed_and_store(config, model, resumes, resume_files)
+
+    progress("Scoring jobs x resumes")
+    matches = top_k or DEFAULT_MATCHES
+    index = MatchIndex(
+        job_embeddings,
+        resume_embeddings,
+        candidates_per_job=matches,
+        jobs_per_candidate=matches,
+        block_size=config.get('matrix_block_size', DEFAULT_BLOCK_SIZE),
+    )
+    files = [os.path.basename(file_path) for file_path in resume_files]
+    lines = []
+    for resume, file_name in enumerate(files):
+        lines.append({"type": "resume", "file": file_name, "jobs": [
+            {"job_id": jobs[job]['id'], "title": jobs[job]['title'], "company": jobs[job]['company'], "score": score}
+            for job, score in index.jobs_for_candidate(resume)
+        ]})
+    for position, job in enumerate(jobs):
+        lines.append({"type": "job", "job_id": job['id'], "title": job['title'], "company": job['company'], "candidates": [
+            {"file": files[resume], "score": score} for resume, score in index.candidates_for_job(position)
+        ]})
+    return lines
+
+def write_results(candidates, output, include_text):
+    for candidate in candidates:
+        if not include_text:
+            candidate = {key: value for key, value in candidate.items() if key != "resume"}
+        output.write(json.dumps(candidate) + "\n")
+        output.flush()
+
+def main():
+    config = load_config()
+    args = parse_args(config)
+    if args.save and args.job_id is None:
+        log("--save needs --job-id")
+        return EXIT_USAGE
+    if args.all_jobs:
+        args.mode = 'embedding'
+    api_key = os.environ.get('OPENAI_API_KEY') or config.get('api_key')
+    if args.mode != 'embedding' and not api_key:
+        log("Set OPENAI_API_KEY or api_key in config.json, or use --mode embedding")
+        return EXIT_USAGE
+
+    store = JobStore()
+    try:
+        description = None if args.all_jobs else job_description(args, store)
+        files = resume_paths(args.resume_dir)
+    except (LookupError, OSError) as e:
+        log(str(e))
+        return EXIT_USAGE
+    if not files:
+        log(f"No files in {args.resume_dir}")
+        return EXIT_USAGE
+
+    start = time.perf_counter()
+    try:
+        progress("Reading resumes", 0, len(files))
+        resumes, resume_files, failed = read_resumes(files, config, args.workers)
+        if not resumes:
+            log("None of the resumes could be read")
+            return EXIT_FAILED
+        if args.all_jobs:
+            candidates, errors = match_all_jobs(config, store, resumes, resume_files, args.top_k), {}
+        elif args.mode == 'embedding':
+            candidates, errors = rank_by_embedding(config, description, resumes, resume_files, args.top_k)
+        else:
+            candidates, errors = rank_by_llm(args, config, description, resumes, resume_files, api_key)
+    except KeyboardInterrupt:
+        log("Cancelled")
+        return EXIT_FAILED
+    except Exception as e:
+        log(f"Ranking failed: {type(e).__name__}: {e}")
+        return EXIT_FAILED
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            write_results(candidates, output, args.include_text)
+    else:
+        write_results(candidates, sys.stdout, args.include_text)
+    if args.save:
+        store.save_rankings(args.job_id, candidates)
+    log(f"Wrote {len(candidates)} results in {time.perf_counter() - start:.1f}s")
+
+    if not candidates:
+        return EXIT_FAILED
+    return EXIT_PARTIAL if failed or errors else EXIT_OK
+
+if __name__ == '__main__':
+    sys.exit(main())
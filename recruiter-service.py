@@ -0,0 +1,291 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from batching import DEFAULT_MAX_BATCH_SIZE, DEFAULT_MAX_WAIT_MS, EmbeddingBatcher, LatencyStats
+from embeddings import DEFAULT_UPSERT_BATCH_SIZE, MODEL_NAME, upsert_in_chunks
+from resume_store import (
+    job_memberships, new_resumes, open_collection, query_talent_pool, resume_id, stack_embeddings, stored_embeddings,
+    talent_pool_filter, update_metadatas
+)
+from scoring import rank
+
+# Long-running HTTP service around the recruiter-chroma.py ranking logic. The
+# model and Chroma collection are loaded once; embedding requests from all
+# connections are micro-batched by EmbeddingBatcher.
+#
+#   POST /rank    {"job_description": "...", "resumes": ["...", ...], "top_k": 10, "job": "..."}
+#                 Without "resumes" the stored talent pool is searched instead,
+#                 optionally filtered by "job" and "ingested_after" (unix time).
+#   POST /ingest  {"resumes": ["...", ...] or [{"text": "...", "metadata": {...}}, ...]}
+#   GET  /metrics p50/p99 latency and throughput per endpoint, batcher stats
+#   GET  /health
+
+CONFIG_FILE = "config.json"
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+def load_config():
+    if os.path.exists(CONFIG_FILE):
+        with open(CONFIG_FILE, 'r') as file:
+            return json.load(file)
+    return {}
+
+def load_model():
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(MODEL_NAME)
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def is_metadata_value(value):
+    # Chroma metadata values are scalars
+    return isinstance(value, (str, int, float, bool))
+
+def check_field(request, field, valid, description):
+    # The field's value if it is missing/null or passes valid, else a 400
+    value = request.get(field)
+    if value is not None and not valid(value):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"'{field}' must be {description}")
+    return value
+
+class RankingService:
+    def __init__(self, model, collection, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait=DEFAULT_MAX_WAIT_MS / 1000,
+                 upsert_batch_size=DEFAULT_UPSERT_BATCH_SIZE):
+        self.model = model
+        self.collection = collection
+        self.upsert_batch_size = upsert_batch_size
+        # One thread for the model so batches never compete for it, one for Chroma
+        self.model_executor = ThreadPoolExecutor(max_workers=1)
+        self.store_executor = ThreadPoolExecutor(max_workers=1)
+        self.batcher = EmbeddingBatcher(model, self.model_executor, max_batch_size, max_wait)
+        self.latency = LatencyStats()
+        self.routes = {
+            ("POST", "/rank"): self.rank,
+            ("POST", "/ingest"): self.ingest,
+            ("GET", "/metrics"): self.metrics,
+            ("GET", "/health"): self.health,
+        }
+
+    async def store(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.store_executor, fn, *args)
+
+    async def embed_resumes(self, resumes, metadatas):
+        # Async counterpart of resume_store.embed_resumes with encoding done by the batcher
+        ids = [resume_id(resume) for resume in resumes]
+        stored_metadatas = {}
+        found = await self.store(
+            stored_embeddings, self.collection, list(dict.fromkeys(ids)), self.upsert_batch_size, stored_metadatas
+        )
+        new_ids, new_documents, new_metadatas = new_resumes(ids, resumes, metadatas, found)
+        tagged_ids, tagged_metadatas = job_memberships(ids, metadatas, stored_metadatas)
+        if tagged_ids:
+            await self.store(update_metadatas, self.collection, tagged_ids, tagged_metadatas, self.upsert_batch_size)
+        if new_ids:
+            new_embeddings = await self.batcher.encode(new_documents)
+            await self.store(
+                upsert_in_chunks, self.collection, new_ids, new_documents, new_embeddings, self.upsert_batch_size,
+                new_metadatas
+            )
+            found.update(zip(new_ids, new_embeddings))
+        return ids, stack_embeddings(ids, found, self.model.get_sentence_embedding_dimension()), len(new_ids)
+
+    async def rank(self, request):
+        job_description = request.get("job_description")
+        if not isinstance(job_description, str) or not job_description.strip():
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'job_description' must be a non-empty string")
+        top_k = check_field(request, "top_k", lambda value: isinstance(value, int) and not isinstance(value, bool) and value > 0,
+                            "a positive integer")
+        job = check_field(request, "job", lambda value: isinstance(value, str), "a string")
+        ingested_after = check_field(request, "ingested_after", is_number, "a unix timestamp")
+        resumes = request.get("resumes")
+
+        if resumes is None:
+            job_embedding = (await self.batcher.encode([job_description]))[0]
+            where = talent_pool_filter(job=job, ingested_after=ingested_after)
+            matches = await self.store(query_talent_pool, self.collection, job_embedding, top_k or 50, where)
+            return {"candidates": [
+                {"ranking": position + 1, "id": match["id"], "score": match["score"], "metadata": match["metadata"]}
+                for position, match in enumerate(matches)
+            ]}
+
+        texts, metadatas = self.parse_resumes(resumes, job)
+        (job_embedding,), (ids, embeddings, embedded) = await asyncio.gather(
+            self.batcher.encode([job_description]),
+            self.embed_resumes(texts, metadatas),
+        )
+        indices, scores = rank(job_embedding, embeddings, k=top_k)
+        return {
+            "candidates": [
+                {"ranking": position + 1, "index": int(index), "id": ids[index], "score": float(score)}
+                for position, (index, score) in enumerate(zip(indices, scores))
+            ],
+            "embedded": embedded,
+        }
+
+    async def ingest(self, request):
+        job = check_field(request, "job", lambda value: isinstance(value, str), "a string")
+        texts, metadatas = self.parse_resumes(request.get("resumes"), job)
+        ids, _, embedded = await self.embed_resumes(texts, metadatas)
+        return {"ids": ids, "embedded": embedded, "already_stored": len(ids) - embedded}
+
+    async def metrics(self, request):
+        return dict(self.latency.summary(), batcher=self.batcher.stats())
+
+    async def health(self, request):
+        return {"status": "ok"}
+
+    def parse_resumes(self, resumes, job=None):
+        if not isinstance(resumes, list) or not resumes:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'resumes' must be a non-empty list")
+        texts = []
+        metadatas = []
+        for resume in resumes:
+            if isinstance(resume, str):
+                resume = {"text": resume}
+            if not isinstance(resume, dict) or not isinstance(resume.get("text"), str):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "each resume must be a string or {\"text\": ..., \"metadata\": {...}}")
+            metadata = resume.get("metadata")
+            if metadata is None:
+                metadata = {}
+            if not isinstance(metadata, dict) or not all(
+                isinstance(key, str) and is_metadata_value(value) for key, value in metadata.items()
+            ):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "resume 'metadata' must be an object of string, number or boolean values")
+            metadata = dict(metadata)
+            if job:
+                metadata.setdefault("job", job)
+            texts.append(resume["text"])
+            metadatas.append(metadata)
+        return texts, metadatas
+
+    async def dispatch(self, method, path, body):
+        handler = self.routes.get((method, path))
+        if handler is None:
+            if any(route_path == path for _, route_path in self.routes):
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} not allowed on {path}")
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"No endpoint {path}")
+        request = {}
+        if body:
+            try:
+                request = json.loads(body)
+            except json.JSONDecodeError as e:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, f"Invalid JSON: {e}")
+            if not isinstance(request, dict):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Request body must be a JSON object")
+        return await handler(request)
+
+    async def handle_connection(self, reader, writer):
+        # Minimal HTTP/1.1 with keep-alive: JSON bodies with a Content-Length only
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                parts = request_line.decode('latin1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode('latin1').partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                if len(parts) != 3:
+                    await self.respond(writer, HTTPStatus.BAD_REQUEST, {"error": "Malformed request line"}, False)
+                    break
+                method, target, version = parts
+                path = target.split("?", 1)[0]
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self.respond(writer, HTTPStatus.BAD_REQUEST, {"error": "Invalid Content-Length"}, False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self.respond(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "Body too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+
+                start = time.perf_counter()
+                try:
+                    status, payload = HTTPStatus.OK, await self.dispatch(method, path, body)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except Exception as e:
+                    print(f"Error handling {method} {path}: {type(e).__name__}: {e}", file=sys.stderr)
+                    status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(e).__name__}: {e}"}
+                if (method, path) in self.routes and path != "/metrics":
+                    self.latency.record(path, time.perf_counter() - start, ok=status == HTTPStatus.OK)
+
+                await self.respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode('utf-8')
+        writer.write(
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin1') + body
+        )
+        await writer.drain()
+
+    async def serve(self, host, port):
+        self.batcher.start()
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"Ranking service listening on http://{host}:{port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.batcher.stop()
+            self.model_executor.shutdown()
+            self.store_executor.shutdown()
+
+def main():
+    config = load_config()
+    parser = argparse.ArgumentParser(description="Serve resume ranking over HTTP.")
+    parser.add_argument("--host", default=config.get('service_host', DEFAULT_HOST))
+    parser.add_argument("--port", type=int, default=config.get('service_port', DEFAULT_PORT))
+    parser.add_argument("--max-batch-size", type=int, default=config.get('service_max_batch_size', DEFAULT_MAX_BATCH_SIZE),
+                        help="texts per model call")
+    parser.add_argument("--max-wait-ms", type=float, default=config.get('service_max_wait_ms', DEFAULT_MAX_WAIT_MS),
+                        help="how long a request may wait for others to join its batch")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    model = load_model()
+    collection = open_collection(config)
+    print(f"Loaded model and vector store in {time.perf_counter() - start:.1f}s")
+
+    service = RankingService(
+        model,
+        collection,
+        max_batch_size=args.max_batch_size,
+        max_wait=args.max_wait_ms / 1000,
+        upsert_batch_size=config.get('upsert_batch_size', DEFAULT_UPSERT_BATCH_SIZE),
+    )
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
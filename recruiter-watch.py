@@ -0,0 +1,115 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from embeddings import DEFAULT_BATCH_SIZE, DEFAULT_UPSERT_BATCH_SIZE, MODEL_NAME
+from extraction import DEFAULT_WORKERS, ExtractionCache, read_files
+from folder_watch import DEFAULT_DEBOUNCE, DEFAULT_POLL_INTERVAL, FolderWatcher, Manifest
+from resume_store import embed_resumes, open_collection
+
+# Watches a drop directory and adds new or changed resumes to the Chroma
+# "resumes" collection used by recruiter-chroma.py and its talent pool search.
+# Files already in watch_manifest.db with the same mtime and size are never
+# read again, including after a restart. Removing a file only drops it from
+# the manifest; its embedding stays in the talent pool.
+
+CONFIG_FILE = "config.json"
+WATCH_BATCH_SIZE = 256
+
+def load_config():
+    if os.path.exists(CONFIG_FILE):
+        with open(CONFIG_FILE, 'r') as file:
+            return json.load(file)
+    return {}
+
+def load_model():
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(MODEL_NAME)
+
+def log(message):
+    print(message, file=sys.stderr, flush=True)
+
+def ingest(entries, manifest, collection, model, config, cache, workers, executor=None):
+    # Manifest rows are written only after the embeddings are stored, so a crash
+    # mid-batch means the batch is picked up again (upserts are idempotent)
+    by_path = {entry["path"]: entry for entry in entries}
+    resumes = []
+    metadatas = []
+    read = []
+    failed = []
+    for file_path, text, error in read_files(
+        list(by_path),
+        workers=workers,
+        executor=executor,
+        cache=cache,
+        max_pages=config.get('max_resume_pages'),
+        max_chars=config.get('max_resume_chars'),
+    ):
+        if error is None:
+            resumes.append(text)
+            metadatas.append({"file": os.path.basename(file_path), "source": "watch"})
+            read.append(by_path[file_path])
+        else:
+            log(f"Error reading {file_path}: {error}")
+            failed.append(dict(by_path[file_path], error=error))
+
+    ids, _, embedded = embed_resumes(
+        collection,
+        model,
+        resumes,
+        metadatas,
+        batch_size=config.get('embed_batch_size', DEFAULT_BATCH_SIZE),
+        upsert_batch_size=config.get('upsert_batch_size', DEFAULT_UPSERT_BATCH_SIZE),
+    )
+    manifest.record([dict(entry, resume_id=id_) for entry, id_ in zip(read, ids)] + failed)
+    return embedded, len(failed)
+
+def main():
+    config = load_config()
+    parser = argparse.ArgumentParser(description="Ingest resumes dropped into a directory.")
+    parser.add_argument("directory", nargs="?", default=config.get('watch_dir'))
+    parser.add_argument("--interval", type=float, default=config.get('watch_interval', DEFAULT_POLL_INTERVAL),
+                        help="seconds between scans")
+    parser.add_argument("--debounce", type=float, default=config.get('watch_debounce', DEFAULT_DEBOUNCE),
+                        help="seconds a file must be left unchanged before it is ingested")
+    parser.add_argument("--workers", type=int, default=config.get('ingest_workers'),
+                        help="processes used to extract resume text (default: CPU count)")
+    parser.add_argument("--once", action="store_true", help="ingest what is there now and exit, e.g. from cron")
+    args = parser.parse_args()
+    if not args.directory or not os.path.isdir(args.directory):
+        parser.error("give a directory to watch (or set watch_dir in config.json)")
+
+    start = time.perf_counter()
+    model = load_model()
+    collection = open_collection(config)
+    manifest = Manifest()
+    cache = ExtractionCache(max_bytes=config.get('extraction_cache_mb', 512) * 1024 * 1024)
+    watcher = FolderWatcher(args.directory, manifest, debounce=args.debounce)
+    # Reused for every batch instead of starting new processes on each scan
+    executor = ProcessPoolExecutor(max_workers=args.workers or DEFAULT_WORKERS)
+    log(f"Watching {args.directory} ({len(manifest.files)} files in manifest), ready in {time.perf_counter() - start:.1f}s")
+
+    try:
+        while True:
+            changed, removed = watcher.poll(require_stable=not args.once)
+            if removed:
+                log(f"{len(removed)} file(s) removed from {args.directory}")
+            for batch_start in range(0, len(changed), WATCH_BATCH_SIZE):
+                batch = changed[batch_start:batch_start + WATCH_BATCH_SIZE]
+                batch_started = time.perf_counter()
+                embedded, failed = ingest(batch, manifest, collection, model, config, cache, args.workers, executor)
+                log(
+                    f"Processed {len(batch)} new or changed file(s): {embedded} embedded, "
+                    f"{len(batch) - embedded - failed} already stored, {failed} unreadable "
+                    f"in {time.perf_counter() - batch_started:.1f}s"
+                )
+            if args.once:
+                break
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
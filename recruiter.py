@@ -1,18 +1,34 @@
+import time
+import_started = time.perf_counter()
 import sys
 import json
 import os
-import threading
 from openai import OpenAI, AssistantEventHandler
+from PyQt5.QtCore import pyqtSignal
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QPushButton, QTextEdit, QFileDialog,
-    QLabel, QLineEdit, QStackedWidget, QTableWidget, QTableWidgetItem, QDialog, QFormLayout,
-    QDialogButtonBox, QHeaderView, QAbstractItemView, QHBoxLayout, QGridLayout, QInputDialog, QMessageBox
+    QLabel, QLineEdit, QStackedWidget, QDialog, QFormLayout,
+    QDialogButtonBox, QHBoxLayout, QListView, QAbstractItemView, QInputDialog, QMessageBox
 )
 from PyQt5.QtGui import QFont
-import fitz  # PyMuPDF
+from concurrent.futures import ProcessPoolExecutor
+from extraction import DEFAULT_WORKERS, ExtractionCache, read_file, read_files
+from assistant import get_or_create_assistant
+from embeddings import DEFAULT_BATCH_SIZE, MODEL_NAME
+from evaluation import (
+    DEFAULT_CACHE_ENTRIES, DEFAULT_CONCURRENCY, DEFAULT_RETRIES, RANKING_RESPONSE_FORMAT, EvaluationCache,
+    evaluate_resumes, merge_rankings, new_stats, rank_candidates, validate_evaluation
+)
+from pipeline import DEFAULT_SHORTLIST_SIZE, hybrid_rank
+from instrumentation import Instrumentation
+from job_store import JobStore
+from job_list import JobListModel, JobRole
+from results_table import ResultsTable
+from warmup import Warmup
+from stream_parser import CandidateStreamParser
+from workers import Cancelled, Worker
 
 CONFIG_FILE = "config.json"
-JOBS_FILE = "jobs.json"
 
 def load_config():
     if os.path.exists(CONFIG_FILE):
@@ -24,15 +40,9 @@ def save_config(config):
     with open(CONFIG_FILE, 'w') as file:
         json.dump(config, file)
 
-def load_jobs():
-    if os.path.exists(JOBS_FILE):
-        with open(JOBS_FILE, 'r') as file:
-            return json.load(file)
-    return []
-
-def save_jobs(jobs):
-    with open(JOBS_FILE, 'w') as file:
-        json.dump(jobs, file)
+def load_model():
+    from sentence_transformers import SentenceTransformer  # Only needed for the hybrid pipeline and slow to import
+    return SentenceTransformer(MODEL_NAME)
 
 class APIKeyDialog(QDialog):
     def __init__(self, parent=None):
@@ -53,14 +63,44 @@ class APIKeyDialog(QDialog):
         return self.api_key_input.text()
 
 class RecruiterApp(QMainWindow):
-    def __init__(self, api_key):
+    warmup_finished = pyqtSignal()
+    assistant_changed = pyqtSignal(dict)
+
+    def __init__(self, api_key, warmup):
         super().__init__()
         self.api_key = api_key
-        self.client = OpenAI(api_key=self.api_key)
         self.config = load_config()
-        self.jobs = load_jobs()
+        self.client = OpenAI(api_key=self.api_key, base_url=self.config.get('openai_base_url'))
+        self.store = JobStore()
+        self.evaluation_cache = EvaluationCache(max_entries=self.config.get('evaluation_cache_entries', DEFAULT_CACHE_ENTRIES))
+        self.instrumentation = Instrumentation(
+            prometheus_file=self.config.get('metrics_prometheus_file'),
+            json_log=self.config.get('metrics_json_log'),
+        )
         self.initUI()
-        self.create_assistant()
+
+        # Creating the assistant is a network round-trip, so it happens in the background
+        self.warmup = warmup
+        self.statusBar().showMessage("Connecting to OpenAI...")
+        self.warmup_finished.connect(self.on_warmup_finished)
+        self.assistant_changed.connect(self.on_assistant_changed)
+        self.warmup.add('assistant', self.create_assistant)
+        if self.config.get('evaluation_mode') == 'hybrid':
+            self.warmup.add('model', load_model)
+        self.warmup.start()
+        self.warmup.on_ready(self.warmup_finished.emit)
+
+    @property
+    def assistant(self):
+        return self.warmup.get('assistant')
+
+    def on_warmup_finished(self):
+        print("Startup timings:", self.warmup.timing_summary())
+        if self.warmup.errors:
+            self.statusBar().showMessage("Not ready: " + "; ".join(f"{name} failed to load" for name in self.warmup.errors))
+            return
+        self.statusBar().showMessage("Ready")
+        self.upload_page.set_ready(True)
 
     def initUI(self):
         self.setWindowTitle('Tech Recruiter Assistant')
@@ -80,12 +120,18 @@ class RecruiterApp(QMainWindow):
         self.setStyleSheet(self.light_mode_stylesheet())
 
     def create_assistant(self):
-        self.assistant = self.client.beta.assistants.create(
-            name="Recruiter Assistant",
-            instructions="You are a recruiter assistant. Evaluate job candidates based on their resumes and a job description. Provide a ranking, overview, pros, and cons for each candidate.",
-            tools=[],
-            model="gpt-4o",
-        )
+        # Runs on the warmup thread, so it works on a copy of config: self.config
+        # is only changed and saved on the GUI thread, in on_assistant_changed
+        config = dict(self.config)
+        assistant = get_or_create_assistant(self.client, config)
+        keys = ('assistant_id', 'assistant_fingerprint')
+        if any(config.get(key) != self.config.get(key) for key in keys):
+            self.assistant_changed.emit({key: config[key] for key in keys})
+        return assistant
+
+    def on_assistant_changed(self, values):
+        self.config.update(values)
+        save_config(self.config)
 
     def light_mode_stylesheet(self):
         return """
@@ -117,7 +163,7 @@ class RecruiterApp(QMainWindow):
             color: #000000;
             font-weight: bold;
         }
-        QTableWidget {
+        QTableView {
             background-color: #ffffff;
             color: #000000;
             border: 1px solid #cccccc;
@@ -159,17 +205,35 @@ class JobPage(QWidget):
     def initUI(self):
         layout = QVBoxLayout()
 
-        self.grid_layout = QGridLayout()
-        self.grid_layout.setSpacing(10)
-
-        self.load_jobs()
+        self.search_box = QLineEdit(self)
+        self.search_box.setPlaceholderText("Search jobs by title or company")
+        layout.addWidget(self.search_box)
 
         create_job_btn = QPushButton('Create Job')
         create_job_btn.setStyleSheet('color: green')
         create_job_btn.clicked.connect(self.create_job)
         layout.addWidget(create_job_btn)
 
-        layout.addLayout(self.grid_layout)
+        self.jobs_model = JobListModel(self.parent.store.list_jobs(), self)
+        self.search_box.textChanged.connect(self.jobs_model.set_filter)
+
+        self.jobs_view = QListView(self)
+        self.jobs_view.setModel(self.jobs_model)
+        self.jobs_view.setUniformItemSizes(True)
+        self.jobs_view.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.jobs_view.doubleClicked.connect(self.open_selected_job)
+        layout.addWidget(self.jobs_view)
+
+        buttons_layout = QHBoxLayout()
+        open_btn = QPushButton("Open")
+        open_btn.clicked.connect(self.open_selected_job)
+        buttons_layout.addWidget(open_btn)
+
+        delete_btn = QPushButton('Delete Job')
+        delete_btn.setStyleSheet('color: red')
+        delete_btn.clicked.connect(self.delete_selected_job)
+        buttons_layout.addWidget(delete_btn)
+        layout.addLayout(buttons_layout)
 
         back_btn = QPushButton('Back to Home')
         back_btn.clicked.connect(self.show_home_page)
@@ -177,34 +241,9 @@ class JobPage(QWidget):
 
         self.setLayout(layout)
 
-    def load_jobs(self):
-        for i in reversed(range(self.grid_layout.count())): 
-            widgetToRemove = self.grid_layout.itemAt(i).widget()
-            self.grid_layout.removeWidget(widgetToRemove)
-            widgetToRemove.setParent(None)
-
-        for index, job in enumerate(self.parent.jobs):
-            self.add_job_card(index, job)
-
-    def add_job_card(self, index, job):
-        job_card = QWidget()
-        card_layout = QVBoxLayout()
-        
-        job_title = QLabel(f"{job['title']} at {job['company']}")
-        card_layout.addWidget(job_title)
-
-        open_btn = QPushButton("Open")
-        open_btn.clicked.connect(lambda checked, index=index: self.open_job(index))
-        card_layout.addWidget(open_btn)
-
-        delete_btn = QPushButton('Delete Job')
-        delete_btn.setStyleSheet('color: red')
-        delete_btn.clicked.connect(lambda checked, index=index: self.delete_job(index))
-        card_layout.addWidget(delete_btn)
-        
-        job_card.setLayout(card_layout)
-        job_card.setMinimumHeight(100)
-        self.grid_layout.addWidget(job_card, index // 2, index % 2)
+    def selected_job(self):
+        index = self.jobs_view.currentIndex()
+        return self.jobs_model.data(index, JobRole) if index.isValid() else None
 
     def create_job(self):
         title, ok = QInputDialog.getText(self, 'Job Title', 'Enter job title:')
@@ -213,27 +252,35 @@ class JobPage(QWidget):
             if ok and company:
                 description, ok = QInputDialog.getMultiLineText(self, 'Job Description', 'Enter job description:')
                 if ok:
-                    new_job = {
-                        "title": title,
-                        "company": company,
-                        "description": description,
-                        "rankings": []
-                    }
-                    self.parent.jobs.append(new_job)
-                    save_jobs(self.parent.jobs)
-                    self.load_jobs()
-
-    def open_job(self, index):
-        job = self.parent.jobs[index]
-        self.parent.upload_page.set_job_index(index)
+                    self.jobs_model.add_job(self.parent.store.create_job(title, company, description))
+
+    def open_selected_job(self):
+        job = self.selected_job()
+        if job is not None:
+            self.open_job(job)
+
+    def delete_selected_job(self):
+        job = self.selected_job()
+        if job is not None:
+            self.delete_job(job)
+
+    def open_job(self, job):
+        self.parent.upload_page.set_job_id(job['id'])
         self.parent.upload_page.set_job_description(job['description'])
-        self.parent.upload_page.load_rankings(job.get('rankings', []))
+        self.parent.upload_page.load_rankings(self.parent.store.get_rankings(job['id']))
         self.parent.central_widget.setCurrentWidget(self.parent.upload_page)
 
-    def delete_job(self, index):
-        del self.parent.jobs[index]
-        save_jobs(self.parent.jobs)
-        self.load_jobs()
+    def delete_job(self, job):
+        run = self.parent.upload_page.runs.pop(job['id'], None)
+        if run is not None:
+            run["worker"].cancel()
+        # Cached evaluations are keyed by description text, which other jobs may
+        # share, so they are left for the cache's LRU eviction
+        self.parent.store.delete_job(job['id'])
+        self.jobs_model.remove_job(job['id'])
+        # Its cancelled run no longer reports back, so unbind the upload page
+        if self.parent.upload_page.job_id == job['id']:
+            self.parent.upload_page.set_job_id(None)
 
     def show_home_page(self):
         self.parent.central_widget.setCurrentWidget(self.parent.home_page)
@@ -242,13 +289,25 @@ class UploadPage(QWidget):
     def __init__(self, parent):
         super().__init__(parent)
         self.parent = parent
-        self.job_index = None
+        self.job_id = None
+        self.ready = False
+        # The run in progress for each job id. Worker signals carry their own run,
+        # so a run that was cancelled or replaced only ever touches itself.
+        self.runs = {}
+        self.files = self.parent.config.get('files', [])
+        cache_mb = self.parent.config.get('extraction_cache_mb', 512)
+        self.extraction_cache = ExtractionCache(max_bytes=cache_mb * 1024 * 1024)
+        # One pool of extraction processes for the app, shared by every job's worker
+        workers = self.parent.config.get('ingest_workers') or DEFAULT_WORKERS
+        self.extraction_pool = ProcessPoolExecutor(max_workers=workers)
         self.initUI()
 
     def initUI(self):
         layout = QVBoxLayout()
 
         self.upload_status = QLabel("No files uploaded.")
+        if self.files:
+            self.upload_status.setText("Files uploaded: " + ", ".join([os.path.basename(file) for file in self.files]))
         layout.addWidget(self.upload_status)
 
         self.upload_btn = QPushButton('Upload Resumes', self)
@@ -262,16 +321,18 @@ class UploadPage(QWidget):
 
         self.process_btn = QPushButton('Process Candidates', self)
         self.process_btn.clicked.connect(self.process_candidates)
+        self.process_btn.setEnabled(False)
         layout.addWidget(self.process_btn)
 
+        self.cancel_btn = QPushButton('Cancel Processing', self)
+        self.cancel_btn.clicked.connect(self.cancel_processing)
+        self.cancel_btn.setEnabled(False)
+        layout.addWidget(self.cancel_btn)
+
         self.processing_label = QLabel("")
         layout.addWidget(self.processing_label)
 
-        self.results_table = QTableWidget(self)
-        self.results_table.setColumnCount(4)
-        self.results_table.setHorizontalHeaderLabels(["Ranking", "Overview", "Pros", "Cons"])
-        self.results_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.results_table.setSelectionMode(QAbstractItemView.NoSelection)
+        self.results_table = ResultsTable(self)
         layout.addWidget(self.results_table)
 
         back_btn = QPushButton('Back to Jobs')
@@ -280,8 +341,19 @@ class UploadPage(QWidget):
 
         self.setLayout(layout)
 
-    def set_job_index(self, index):
-        self.job_index = index
+    def set_ready(self, ready):
+        self.ready = ready
+        self.update_buttons()
+
+    def update_buttons(self):
+        running = self.job_id in self.runs
+        self.process_btn.setEnabled(self.ready and not running)
+        self.cancel_btn.setEnabled(running)
+
+    def set_job_id(self, job_id):
+        self.job_id = job_id
+        self.processing_label.setText("Processing..." if job_id in self.runs else "")
+        self.update_buttons()
 
     def set_job_description(self, description):
         self.job_desc.setText(description)
@@ -300,9 +372,176 @@ class UploadPage(QWidget):
         self.parent.config['job_description'] = job_description
         save_config(self.parent.config)
 
-        resumes = [self.read_file(file) for file in self.files]
+        # Each job gets its own worker, so several jobs can be processed at once
+        trace = self.parent.instrumentation.start(f"job {self.job_id}")
+        worker = Worker(self.evaluate_candidates, job_description, list(self.files), trace)
+        trace.listener = worker.signals.metrics.emit
+        run = {"job_id": self.job_id, "worker": worker, "trace": trace, "partial": []}
+        worker.signals.progress.connect(lambda stage, done, total, run=run: self.on_progress(run, stage, done, total))
+        worker.signals.partial.connect(lambda candidate, run=run: self.on_partial(run, candidate))
+        worker.signals.metrics.connect(lambda summary, run=run: self.on_metrics(run, summary))
+        worker.signals.finished.connect(lambda result, run=run: self.on_finished(run, result))
+        worker.signals.failed.connect(lambda error, run=run: self.on_stopped(run, "Processing failed: " + error, "failed"))
+        worker.signals.cancelled.connect(lambda run=run: self.on_stopped(run, "Processing cancelled.", "cancelled"))
+        self.runs[self.job_id] = run
+        worker.start()
 
         self.processing_label.setText("Processing...")
+        self.update_buttons()
+
+    def cancel_processing(self):
+        run = self.runs.get(self.job_id)
+        if run is not None:
+            run["worker"].cancel()
+            self.processing_label.setText("Cancelling...")
+
+    def is_shown(self, run):
+        # Only the current run of the job on screen updates the page
+        return run["job_id"] == self.job_id and self.runs.get(self.job_id) is run
+
+    def end_run(self, run):
+        if self.runs.get(run["job_id"]) is run:
+            del self.runs[run["job_id"]]
+
+    def on_progress(self, run, stage, done, total):
+        if self.is_shown(run):
+            self.processing_label.setText(f"{stage}... {done}/{total}" if total else f"{stage}...")
+
+    def on_partial(self, run, candidate):
+        # Rows are appended as the assistant streams them; the final parse in
+        # on_finished replaces them with the complete ranking
+        run["partial"].append(candidate)
+        if self.is_shown(run):
+            if len(run["partial"]) == 1:
+                self.results_table.clear()
+            self.results_table.append(candidate)
+
+    def on_metrics(self, run, summary):
+        if self.is_shown(run):
+            self.parent.statusBar().showMessage(summary)
+
+    def on_finished(self, run, result):
+        candidates, message = result
+        shown = self.is_shown(run)
+        self.end_run(run)
+        try:
+            with run["trace"].span("save"):
+                self.save_rankings(candidates, run["job_id"])
+        finally:
+            self.finish_trace(run, "ok", shown)
+        if shown:
+            self.processing_label.setText(message)
+            self.populate_table(candidates)
+        self.update_buttons()
+
+    def on_stopped(self, run, message, status):
+        shown = self.is_shown(run)
+        self.end_run(run)
+        self.finish_trace(run, status, shown)
+        if shown:
+            self.processing_label.setText(message)
+        self.update_buttons()
+
+    def finish_trace(self, run, status, shown):
+        trace = run["trace"]
+        finished = self.parent.instrumentation.finish(trace, status)
+        if shown:
+            message = f"Last run ({status}): {trace.summary()}"
+            if "export_error" in finished:
+                message += f" (metrics not exported: {finished['export_error']})"
+            self.parent.statusBar().showMessage(message)
+
+    def evaluate_candidates(self, worker, job_description, files, trace):
+        # Runs on the thread pool: no widget access in here. Stages are timed on
+        # trace; stats counts this run's retries and tokens.
+        stats = new_stats()
+        cache_stats = {"hits": 0, "misses": 0}
+        with trace.span("read_resumes"):
+            resumes, resume_files, failed = self.read_files(files, worker, cache_stats)
+        stats["extraction_hits"] = cache_stats["hits"]
+        stats["extraction_misses"] = cache_stats["misses"]
+        mode = self.parent.config.get('evaluation_mode', 'map_reduce')
+        try:
+            if mode == 'assistant':
+                return self.evaluate_in_thread(worker, job_description, resumes, resume_files, failed, trace, stats)
+            if mode == 'hybrid':
+                return self.evaluate_shortlist(worker, job_description, resumes, resume_files, failed, trace, stats)
+            return self.evaluate_concurrently(worker, job_description, resumes, resume_files, failed, trace, stats)
+        finally:
+            trace.add_usage(stats)
+
+    def evaluate_shortlist(self, worker, job_description, resumes, resume_files, failed, trace, stats):
+        # Embedding similarity picks the shortlist, only the shortlist goes to the LLM
+        config = self.parent.config
+        labels = [os.path.basename(file_path) for file_path in resume_files]
+        worker.report("Loading model")
+        with trace.span("load_model"):
+            model = self.parent.warmup.get('model')
+        candidates, errors, report = hybrid_rank(
+            model,
+            job_description,
+            resumes,
+            self.parent.api_key,
+            base_url=config.get('openai_base_url'),
+            top_k=config.get('shortlist_top_k', DEFAULT_SHORTLIST_SIZE),
+            threshold=config.get('shortlist_threshold'),
+            details=[{"file": label} for label in labels],
+            batch_size=config.get('embed_batch_size', DEFAULT_BATCH_SIZE),
+            concurrency=config.get('evaluation_concurrency', DEFAULT_CONCURRENCY),
+            cache=self.parent.evaluation_cache,
+            progress=worker.report,
+            max_retries=config.get('evaluation_retries', DEFAULT_RETRIES),
+            stats=stats,
+        )
+        trace.record("shortlist", report["timings"]["shortlist"])
+        trace.record("evaluate", report["timings"]["evaluation"])
+
+        timings = report["timings"]
+        counts = report["counts"]
+        message = (
+            self.completion_message(failed, stats)
+            + f" Shortlisted {counts['shortlisted']} of {counts['resumes']} resumes in {timings['shortlist']:.1f}s,"
+            + f" evaluated {counts['evaluated']} in {timings['evaluation']:.1f}s."
+        )
+        if errors:
+            for index, error in errors.items():
+                print(f"Error evaluating {resume_files[index]}: {error}")
+            message += f" {len(errors)} candidate evaluation(s) failed: " + ", ".join(labels[index] for index in errors)
+        return candidates, message
+
+    def evaluate_concurrently(self, worker, job_description, resumes, resume_files, failed, trace, stats):
+        # One request per candidate, merged into a single ranking afterwards, so a
+        # bad response only loses that candidate
+        config = self.parent.config
+        labels = [os.path.basename(file_path) for file_path in resume_files]
+        worker.report("Evaluating candidates", 0, len(resumes))
+        with trace.span("evaluate"):
+            candidates, errors = rank_candidates(
+                job_description,
+                resumes,
+                self.parent.api_key,
+                base_url=config.get('openai_base_url'),
+                concurrency=config.get('evaluation_concurrency', DEFAULT_CONCURRENCY),
+                details=[{"file": label} for label in labels],
+                progress=lambda done, total: worker.report("Evaluating candidates", done, total),
+                cache=self.parent.evaluation_cache,
+                max_retries=config.get('evaluation_retries', DEFAULT_RETRIES),
+                stats=stats,
+            )
+
+        message = self.completion_message(failed, stats)
+        message += f" (evaluation cache: {stats['cache_hits']} hits, {stats['cache_misses']} misses)"
+        if errors:
+            for index, error in errors.items():
+                print(f"Error evaluating {resume_files[index]}: {error}")
+            message += f" {len(errors)} candidate evaluation(s) failed: " + ", ".join(labels[index] for index in errors)
+        return candidates, message
+
+    def evaluate_in_thread(self, worker, job_description, resumes, resume_files, failed, trace, stats):
+        worker.report("Connecting to assistant")
+        with trace.span("connect"):
+            assistant = self.parent.assistant
+        send_started = time.perf_counter()
 
         # Create a new thread for the conversation
         thread = self.parent.client.beta.threads.create()
@@ -314,48 +553,116 @@ class UploadPage(QWidget):
             content=f"""
                 Job Description: {job_description}
 
-                Evaluate each candidate based on their resume and the job description. Provide a ranking, overview, pros, and cons for each candidate in the following JSON format:
-
-                [
-                    {{
-                        "ranking": "1",
-                        "overview": "Candidate's overview",
-                        "pros": "List of pros",
-                        "cons": "List of cons"
-                    }},
-                    {{
-                        "ranking": "2",
-                        "overview": "Candidate's overview",
-                        "pros": "List of pros",
-                        "cons": "List of cons"
-                    }},
-                    ...
-                ]
-
-                Ensure the response is a valid JSON array.
+                Evaluate each candidate based on their resume and the job description. Provide a ranking, score, overview, pros, and cons for each candidate in the following JSON format, where "resume_index" is the number of the resume message:
+
+                {{
+                    "candidates": [
+                        {{
+                            "resume_index": 1,
+                            "ranking": "1",
+                            "score": 0-100 rating of how well the candidate fits the job,
+                            "overview": "Candidate's overview",
+                            "pros": ["pro", ...],
+                            "cons": ["con", ...]
+                        }},
+                        ...
+                    ]
+                }}
+
+                Include every resume exactly once.
             """
         )
 
         # Add each resume as a separate message
-        for resume in resumes:
+        for index, resume in enumerate(resumes):
+            worker.report("Sending resumes", index + 1, len(resumes))
             self.parent.client.beta.threads.messages.create(
                 thread_id=thread.id,
                 role="user",
-                content=f"Resume: {resume}"
+                content=f"Resume {index + 1}: {resume}"
             )
 
-        # Run the assistant on a separate thread to avoid blocking the UI
-        threading.Thread(target=self.run_thread, args=(thread.id,)).start()
-
-    def run_thread(self, thread_id):
-        parent = self
+        trace.record("send_resumes", time.perf_counter() - send_started)
+
+        worker.report("Evaluating candidates")
+        results_text, streamed = self.run_thread(worker, thread.id, assistant.id, trace)
+        with trace.span("validate"):
+            evaluations, invalid = self.validate_results(self.parse_results(results_text) or streamed, len(resumes))
+
+        # Only the candidates that came back invalid or not at all are re-requested,
+        # one request each, instead of rerunning the whole batch
+        stats["invalid"] += invalid
+        missing = [index for index, evaluation in enumerate(evaluations) if evaluation is None]
+        errors = {}
+        if missing:
+            config = self.parent.config
+            stats["retries"] += len(missing)
+            with trace.span("retry"):
+                retried, retry_errors = evaluate_resumes(
+                    job_description,
+                    [resumes[index] for index in missing],
+                    self.parent.api_key,
+                    base_url=config.get('openai_base_url'),
+                    concurrency=config.get('evaluation_concurrency', DEFAULT_CONCURRENCY),
+                    progress=lambda done, total: worker.report("Retrying candidates", done, total),
+                    cache=self.parent.evaluation_cache,
+                    max_retries=config.get('evaluation_retries', DEFAULT_RETRIES),
+                    stats=stats,
+                )
+            for position, index in enumerate(missing):
+                evaluations[index] = retried[position]
+            errors = {missing[position]: error for position, error in retry_errors.items()}
+
+        labels = [os.path.basename(file_path) for file_path in resume_files]
+        candidates = merge_rankings(evaluations, [{"file": label} for label in labels])
+        message = self.completion_message(failed, stats)
+        if errors:
+            for index, error in errors.items():
+                print(f"Error evaluating {resume_files[index]}: {error}")
+            message += f" {len(errors)} candidate evaluation(s) failed: " + ", ".join(labels[index] for index in errors)
+        return candidates, message
+
+    def validate_results(self, candidates, resume_count):
+        # Returns (evaluations aligned with the resume messages, number of entries
+        # that were malformed, duplicated or pointed at no resume)
+        evaluations = [None] * resume_count
+        invalid = 0
+        for candidate in candidates:
+            try:
+                index = int(candidate["resume_index"]) - 1
+                evaluation = validate_evaluation(candidate)
+            except (KeyError, TypeError, ValueError):
+                invalid += 1
+                continue
+            if 0 <= index < resume_count and evaluations[index] is None:
+                evaluations[index] = evaluation
+            else:
+                invalid += 1
+        return evaluations, invalid
+
+    def run_thread(self, worker, thread_id, assistant_id, trace):
+        stream_started = time.perf_counter()
+
+        class EventHandler(AssistantEventHandler):
+            def __init__(self):
+                super().__init__()
+                self.chunks = []
+                self.parser = CandidateStreamParser()
+                self.candidates = []
 
-        class EventHandler(AssistantEventHandler):    
             def on_text_created(self, text) -> None:
                 pass
               
             def on_text_delta(self, delta, snapshot):
-                parent.results_text += delta.value
+                if worker.is_cancelled():
+                    raise Cancelled()
+                if not self.chunks:
+                    trace.observe("time_to_first_token_seconds", time.perf_counter() - stream_started)
+                self.chunks.append(delta.value)
+                for candidate in self.parser.feed(delta.value):
+                    if isinstance(candidate, dict) and all(key in candidate for key in ("ranking", "overview", "pros", "cons")):
+                        self.candidates.append(candidate)
+                        worker.publish(candidate)
               
             def on_tool_call_created(self, tool_call):
                 pass
@@ -367,28 +674,35 @@ class UploadPage(QWidget):
                     if delta.code_interpreter.outputs:
                         for output in delta.code_interpreter.outputs:
                             if output.type == "logs":
-                                parent.results_text += output.logs
-
-        self.results_text = ""
-        with self.parent.client.beta.threads.runs.stream(
-            thread_id=thread_id,
-            assistant_id=self.parent.assistant.id,
-            instructions="Evaluate each candidate based on their resume and job description. Provide a ranking, overview, pros, and cons for each candidate in a structured format.",
-            event_handler=EventHandler(),
-        ) as stream:
-            stream.until_done()
-
-        print("Raw API response:", self.results_text)  # Debug print to see the raw API response
-        self.processing_label.setText("Processing complete.")
-        self.format_results()
-
-    def format_results(self):
-        candidates = self.parse_results(self.results_text)
-        self.populate_table(candidates)
-        self.save_rankings(candidates)
+                                self.chunks.append(output.logs)
+
+        handler = EventHandler()
+        try:
+            with self.parent.client.beta.threads.runs.stream(
+                thread_id=thread_id,
+                assistant_id=assistant_id,
+                instructions="Evaluate each candidate based on their resume and job description. Provide a ranking, overview, pros, and cons for each candidate in a structured format.",
+                event_handler=handler,
+                response_format=RANKING_RESPONSE_FORMAT,
+            ) as stream:
+                stream.until_done()
+        except Cancelled:
+            # Stop the run server-side too so it doesn't keep burning tokens
+            if handler.current_run is not None:
+                self.parent.client.beta.threads.runs.cancel(thread_id=thread_id, run_id=handler.current_run.id)
+            raise
+        finally:
+            trace.record("stream", time.perf_counter() - stream_started)
+
+        results_text = "".join(handler.chunks)
+        trace.observe("response_chars", len(results_text))
+        if handler.current_run is not None and handler.current_run.usage is not None:
+            trace.add_usage(handler.current_run.usage)
+        return results_text, handler.candidates
 
     def parse_results(self, text):
         # Remove code fences if present
+        text = text.strip()
         if text.startswith("```json") and text.endswith("```"):
             text = text[7:-3].strip()
         elif text.startswith("```") and text.endswith("```"):
@@ -397,57 +711,76 @@ class UploadPage(QWidget):
         try:
             candidates = json.loads(text)
         except json.JSONDecodeError:
-            print("Error parsing JSON")
-            print("Raw JSON text:", text)  # Debug print to see what was attempted to be parsed
+            # Falls back to the streamed candidates; missing ones are retried
             return []
 
-        return candidates
+        # Structured output wraps the list as {"candidates": [...]}
+        if isinstance(candidates, dict):
+            candidates = candidates.get("candidates", [])
+        return candidates if isinstance(candidates, list) else []
 
     def populate_table(self, candidates):
-        self.results_table.setRowCount(len(candidates))
-        for row, candidate in enumerate(candidates):
-            self.results_table.setItem(row, 0, QTableWidgetItem(candidate["ranking"]))
-            self.results_table.setItem(row, 1, QTableWidgetItem(candidate["overview"]))
-            self.results_table.setItem(row, 2, QTableWidgetItem(", ".join(candidate["pros"])))
-            self.results_table.setItem(row, 3, QTableWidgetItem(", ".join(candidate["cons"])))
-        self.results_table.resizeRowsToContents()  # Adjust row heights
-
-    def save_rankings(self, candidates):
-        if self.job_index is not None:
-            self.parent.jobs[self.job_index]['rankings'] = candidates
-            save_jobs(self.parent.jobs)
+        self.results_table.set_candidates(candidates)
+
+    def save_rankings(self, candidates, job_id):
+        # The job may have been deleted while its worker was still running
+        if job_id is not None and self.parent.store.get_job(job_id) is not None:
+            self.parent.store.save_rankings(job_id, candidates)
 
     def load_rankings(self, rankings):
-        self.populate_table(rankings)
+        # A job that is still streaming shows what has arrived so far
+        run = self.runs.get(self.job_id)
+        self.populate_table((run and run["partial"]) or rankings)
+
+    def completion_message(self, failed_files, evaluation_stats):
+        message = "Processing complete."
+        if failed_files:
+            message += f" Skipped {len(failed_files)} unreadable file(s): " + ", ".join(failed_files)
+        message += (
+            f" (extraction cache: {evaluation_stats['extraction_hits']} hits,"
+            f" {evaluation_stats['extraction_misses']} misses)"
+        )
+        if evaluation_stats["invalid"] or evaluation_stats["retries"]:
+            message += (
+                f" (retried {evaluation_stats['retries']} candidate(s), discarded {evaluation_stats['invalid']}"
+                f" invalid response(s), {evaluation_stats['wasted_tokens']} tokens wasted)"
+            )
+        return message
 
     def read_file(self, file_path):
-        if file_path.lower().endswith('.pdf'):
-            return self.read_pdf(file_path)
-        else:
-            return self.read_text_file(file_path)
-
-    def read_text_file(self, file_path):
-        encodings = ['utf-8', 'latin1', 'utf-16', 'iso-8859-1']
-        for encoding in encodings:
-            try:
-                with open(file_path, 'r', encoding=encoding) as file:
-                    return file.read().replace('\n', ' ')
-            except (UnicodeDecodeError, FileNotFoundError):
-                continue
-        raise UnicodeDecodeError(f"Unable to decode the file: {file_path}")
-
-    def read_pdf(self, file_path):
-        doc = fitz.open(file_path)
-        text = ""
-        for page_num in range(len(doc)):
-            page = doc.load_page(page_num)
-            text += page.get_text().replace('\n', ' ')
-        return text
+        return read_file(file_path)
+
+    def read_files(self, files, worker=None, cache_stats=None):
+        # Every resume's text is kept for ranking; only the files being extracted
+        # at once are bounded, by read_files' max_pending
+        resumes = []
+        resume_files = []
+        failed = []
+        config = self.parent.config
+        for file_path, text, error in read_files(
+            files,
+            workers=config.get('ingest_workers'),
+            cache=self.extraction_cache,
+            max_pages=config.get('max_resume_pages'),
+            max_chars=config.get('max_resume_chars'),
+            stats=cache_stats,
+            executor=self.extraction_pool,
+        ):
+            if worker is not None:
+                worker.report("Reading resumes", len(resumes) + len(failed) + 1, len(files))
+            if error is None:
+                resumes.append(text)
+                resume_files.append(file_path)
+            else:
+                failed.append(f"{os.path.basename(file_path)} ({error})")
+        return resumes, resume_files, failed
 
     def show_job_page(self):
         self.parent.central_widget.setCurrentWidget(self.parent.job_page)
 
 if __name__ == '__main__':
+    warmup = Warmup()
+    warmup.timings["imports"] = time.perf_counter() - import_started
     app = QApplication(sys.argv)
 
     config = load_config()
@@ -459,6 +792,6 @@ if __name__ == '__main__':
             config['api_key'] = api_key
             save_config(config)
 
-    ex = RecruiterApp(api_key)
+    ex = RecruiterApp(api_key, warmup)
     ex.show()
     sys.exit(app.exec_())
@@ -0,0 +1,242 @@
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt5.QtWidgets import (
+    QAbstractItemView, QDialog, QDialogButtonBox, QHeaderView, QLineEdit, QTableView, QTextEdit, QVBoxLayout, QWidget
+)
+
+COLUMNS = ["Ranking", "Overview", "Pros", "Cons"]
+FETCH_BATCH_SIZE = 200
+SNIPPET_CHARS = 200
+TOOLTIP_CHARS = 1000
+SEARCH_CHARS = 2000
+FullTextRole = Qt.UserRole + 1
+
+def format_list(value):
+    # Older saved rankings hold pros/cons as a single string
+    return value if isinstance(value, str) else ", ".join(value)
+
+def cell_text(candidate, column):
+    if column == 0:
+        return str(candidate.get("ranking", ""))
+    if column == 1:
+        # Embedding-only results have no overview, just the resume text
+        return candidate.get("overview") or candidate.get("resume", "")
+    return format_list(candidate.get("pros" if column == 2 else "cons", ""))
+
+def snippet(text, limit):
+    text = " ".join(text[:limit + 1].split())
+    return text if len(text) <= limit else text[:limit].rstrip() + "…"
+
+def ranking_key(candidate):
+    ranking = str(candidate.get("ranking", ""))
+    return (0, int(ranking), "") if ranking.isdigit() else (1, 0, ranking)
+
+class CandidateTableModel(QAbstractTableModel):
+    # Holds every candidate but only exposes rows to the view in batches of
+    # FETCH_BATCH_SIZE as it scrolls (canFetchMore/fetchMore). Cells are one-line
+    # snippets built when painted; the full text is available under FullTextRole.
+    # Filtering and sorting reorder a list of indices, never the candidates. The
+    # filter matches, and text columns sort by, the first SEARCH_CHARS of each
+    # column, lowercased once.
+    def __init__(self, parent=None, fetch_batch_size=FETCH_BATCH_SIZE):
+        super().__init__(parent)
+        self.fetch_batch_size = fetch_batch_size
+        self.candidates = []
+        self.rows = []
+        self.loaded = 0
+        self.search_text = None
+        self.sort_keys = None
+        self.filter_text = ""
+        self.sort_column = None
+        self.sort_order = Qt.AscendingOrder
+
+    def set_candidates(self, candidates):
+        self.beginResetModel()
+        self.candidates = list(candidates)
+        self.search_text = None
+        self.sort_keys = None
+        self.update_rows()
+        self.endResetModel()
+
+    def append(self, candidate):
+        self.candidates.append(candidate)
+        if self.search_text is not None:
+            self.search_text.append(self.searchable(candidate))
+        if self.sort_keys is not None:
+            self.sort_keys.append(self.make_sort_key(candidate))
+        index = len(self.candidates) - 1
+        if not self.matches(index):
+            return
+        position = len(self.rows)
+        if self.sort_column is not None:
+            key = self.sort_key(index)
+            reverse = self.sort_order == Qt.DescendingOrder
+            position = next(
+                (row for row, other in enumerate(self.rows)
+                 if (self.sort_key(other) < key if reverse else self.sort_key(other) > key)),
+                len(self.rows),
+            )
+        if position < self.loaded or self.loaded == len(self.rows):
+            self.beginInsertRows(QModelIndex(), position, position)
+            self.rows.insert(position, index)
+            self.loaded += 1
+            self.endInsertRows()
+        else:
+            # Past the loaded rows the view hasn't seen yet; fetchMore picks it up
+            self.rows.insert(position, index)
+
+    def clear(self):
+        self.set_candidates([])
+
+    def candidate(self, row):
+        return self.candidates[self.rows[row]]
+
+    def set_filter(self, text):
+        text = text.strip().lower()
+        narrowing = bool(self.filter_text) and self.filter_text in text
+        self.beginResetModel()
+        self.filter_text = text
+        if narrowing:
+            # Typing more only removes rows, so search the ones still shown
+            self.rows = [index for index in self.rows if self.matches(index)]
+            self.loaded = min(len(self.rows), self.fetch_batch_size)
+        else:
+            self.update_rows()
+        self.endResetModel()
+
+    def searchable(self, candidate):
+        return "\n".join(
+            cell_text(candidate, column)[:SEARCH_CHARS] for column in range(1, len(COLUMNS))
+        ).lower()
+
+    def matches(self, index):
+        if not self.filter_text:
+            return True
+        if self.search_text is None:
+            self.search_text = [self.searchable(candidate) for candidate in self.candidates]
+        return self.filter_text in self.search_text[index]
+
+    def sort_key(self, index):
+        if self.sort_keys is None:
+            self.sort_keys = [self.make_sort_key(candidate) for candidate in self.candidates]
+        return self.sort_keys[index]
+
+    def make_sort_key(self, candidate):
+        if self.sort_column == 0:
+            return ranking_key(candidate)
+        return cell_text(candidate, self.sort_column)[:SEARCH_CHARS].lower()
+
+    def update_rows(self):
+        self.rows = [index for index in range(len(self.candidates)) if self.matches(index)]
+        if self.sort_column is not None:
+            self.rows.sort(key=self.sort_key, reverse=self.sort_order == Qt.DescendingOrder)
+        self.loaded = min(len(self.rows), self.fetch_batch_size)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.loaded
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and self.loaded < len(self.rows)
+
+    def fetchMore(self, parent):
+        count = min(self.fetch_batch_size, len(self.rows) - self.loaded)
+        if parent.isValid() or count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self.loaded, self.loaded + count - 1)
+        self.loaded += count
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= self.loaded:
+            return None
+        if role == Qt.DisplayRole:
+            return snippet(cell_text(self.candidate(index.row()), index.column()), SNIPPET_CHARS)
+        if role == Qt.ToolTipRole:
+            return snippet(cell_text(self.candidate(index.row()), index.column()), TOOLTIP_CHARS)
+        if role == FullTextRole:
+            return cell_text(self.candidate(index.row()), index.column())
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return COLUMNS[section]
+        return super().headerData(section, orientation, role)
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.beginResetModel()
+        if column != self.sort_column:
+            self.sort_keys = None
+        self.sort_column = column
+        self.sort_order = order
+        self.update_rows()
+        self.endResetModel()
+
+class CandidateDialog(QDialog):
+    def __init__(self, candidate, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Candidate {candidate.get('ranking', '')}")
+        self.resize(700, 600)
+        layout = QVBoxLayout()
+
+        sections = []
+        for field in ("file", "score", "similarity"):
+            if field in candidate:
+                sections.append(f"{field.capitalize()}: {candidate[field]}")
+        for column in range(1, len(COLUMNS)):
+            text = cell_text(candidate, column)
+            if text:
+                sections.append(f"{COLUMNS[column]}:\n{text}")
+        if candidate.get("overview") and candidate.get("resume"):
+            sections.append("Resume:\n" + candidate["resume"])
+
+        text = QTextEdit(self)
+        text.setReadOnly(True)
+        text.setPlainText("\n\n".join(sections))
+        layout.addWidget(text)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Close)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+        self.setLayout(layout)
+
+class ResultsTable(QWidget):
+    # Filter box over a lazily loaded table; double-click a row for its full text
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.filter_box = QLineEdit(self)
+        self.filter_box.setPlaceholderText("Filter candidates")
+        layout.addWidget(self.filter_box)
+
+        self.model = CandidateTableModel(self)
+        self.filter_box.textChanged.connect(self.model.set_filter)
+
+        self.view = QTableView(self)
+        self.view.setModel(self.model)
+        self.view.setWordWrap(False)
+        self.view.setSelectionMode(QAbstractItemView.NoSelection)
+        self.view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.view.verticalHeader().hide()
+        self.view.setSortingEnabled(True)
+        self.view.sortByColumn(0, Qt.AscendingOrder)
+        self.view.doubleClicked.connect(self.show_candidate)
+        layout.addWidget(self.view)
+
+        self.setLayout(layout)
+
+    def set_candidates(self, candidates):
+        self.model.set_candidates(candidates)
+
+    def append(self, candidate):
+        self.model.append(candidate)
+
+    def clear(self):
+        self.model.clear()
+
+    def show_candidate(self, index):
+        CandidateDialog(self.model.candidate(index.row()), self).exec_()
@@ -0,0 +1,150 @@
+import hashlib
+import time
+import numpy as np
+from embeddings import DEFAULT_BATCH_SIZE, DEFAULT_UPSERT_BATCH_SIZE, encode_batched, upsert_in_chunks
+
+COLLECTION_NAME = "resumes"
+DEFAULT_CHROMA_PATH = "chroma_db"
+
+def create_client(config):
+    # 'persistent' (default) keeps the store on local disk, 'http' talks to the
+    # server from docker-compose.yml, 'memory' is the old throwaway client
+    import chromadb  # Slow to import, so only pay for it when a client is actually built
+    backend = config.get('chroma_backend', 'persistent')
+    if backend == 'http':
+        return chromadb.HttpClient(host=config.get('chroma_host', 'localhost'), port=config.get('chroma_port', 8000))
+    if backend == 'memory':
+        return chromadb.Client()
+    return chromadb.PersistentClient(path=config.get('chroma_path', DEFAULT_CHROMA_PATH))
+
+def get_collection(client):
+    return client.get_or_create_collection(name=COLLECTION_NAME, metadata={"hnsw:space": "cosine"})
+
+def open_collection(config):
+    # vector_store 'chroma' (default) is the Chroma collection from create_client;
+    # 'mmap' is the compact local VectorStore, float16 or int8 per vector_store_dtype
+    if config.get('vector_store', 'chroma') == 'mmap':
+        from vector_store import DEFAULT_DTYPE, DEFAULT_VECTOR_STORE_PATH, VectorStore
+        return VectorStore(
+            config.get('vector_store_path', DEFAULT_VECTOR_STORE_PATH),
+            dtype=config.get('vector_store_dtype', DEFAULT_DTYPE),
+        )
+    return get_collection(create_client(config))
+
+def resume_id(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def job_key(job):
+    # Metadata values must be scalars, so every source job a resume was uploaded
+    # for gets its own boolean key; "job" keeps the first one for display
+    return "job_" + resume_id(job)[:16]
+
+def stored_embeddings(collection, ids, chunk_size=DEFAULT_UPSERT_BATCH_SIZE, metadatas=None):
+    # With a metadatas dict, each found id's stored metadata is put in it too
+    found = {}
+    include = ["embeddings"] if metadatas is None else ["embeddings", "metadatas"]
+    for start in range(0, len(ids), chunk_size):
+        result = collection.get(ids=ids[start:start + chunk_size], include=include)
+        for id_, embedding in zip(result["ids"], result["embeddings"]):
+            found[id_] = np.asarray(embedding, dtype=np.float32)
+        if metadatas is not None:
+            metadatas.update(zip(result["ids"], result["metadatas"]))
+    return found
+
+def embed_resumes(collection, model, resumes, metadatas, batch_size=DEFAULT_BATCH_SIZE,
+                  upsert_batch_size=DEFAULT_UPSERT_BATCH_SIZE, progress=None, timings=None):
+    # Returns (ids, embeddings in input order, number newly embedded). Resumes whose
+    # content hash is already in the collection are read back instead of re-encoded.
+    # A timings dict gets the seconds spent in the lookup, encode and upsert steps.
+    timings = {} if timings is None else timings
+    start = time.perf_counter()
+    ids = [resume_id(resume) for resume in resumes]
+    stored_metadatas = {}
+    found = stored_embeddings(collection, list(dict.fromkeys(ids)), upsert_batch_size, stored_metadatas)
+    new_ids, new_documents, new_metadatas = new_resumes(ids, resumes, metadatas, found)
+    update_metadatas(collection, *job_memberships(ids, metadatas, stored_metadatas), chunk_size=upsert_batch_size)
+    timings["lookup"] = time.perf_counter() - start
+
+    if new_ids:
+        start = time.perf_counter()
+        new_embeddings = encode_batched(model, new_documents, batch_size=batch_size, progress=progress)
+        timings["encode"] = time.perf_counter() - start
+        start = time.perf_counter()
+        upsert_in_chunks(collection, new_ids, new_documents, new_embeddings, chunk_size=upsert_batch_size,
+                         metadatas=new_metadatas)
+        timings["upsert"] = time.perf_counter() - start
+        found.update(zip(new_ids, new_embeddings))
+
+    return ids, stack_embeddings(ids, found, model.get_sentence_embedding_dimension()), len(new_ids)
+
+def new_resumes(ids, resumes, metadatas, found):
+    # The (ids, documents, metadatas) not in found yet, each unique id once
+    seen = set(found)
+    new_ids = []
+    new_documents = []
+    new_metadatas = []
+    for id_, resume, metadata in zip(ids, resumes, metadatas):
+        if id_ not in seen:
+            seen.add(id_)
+            new_ids.append(id_)
+            new_documents.append(resume)
+            new_metadatas.append(tag_job(dict(metadata, ingested_at=int(time.time()))))
+    return new_ids, new_documents, new_metadatas
+
+def tag_job(metadata):
+    if metadata.get("job"):
+        metadata[job_key(metadata["job"])] = True
+    return metadata
+
+def job_memberships(ids, metadatas, stored_metadatas):
+    # (ids, metadatas) to write back for stored resumes uploaded again for a job
+    # they aren't tagged with yet. Older entries only have "job", so that one is
+    # tagged as well.
+    updates = {}
+    for id_, metadata in zip(ids, metadatas):
+        job = metadata.get("job")
+        if id_ not in stored_metadatas or not job:
+            continue
+        stored = updates.get(id_) or tag_job(dict(stored_metadatas[id_] or {}))
+        if not stored.get(job_key(job)):
+            updates[id_] = dict(stored, **{job_key(job): True})
+    return list(updates), list(updates.values())
+
+def update_metadatas(collection, ids, metadatas, chunk_size=DEFAULT_UPSERT_BATCH_SIZE):
+    for start in range(0, len(ids), chunk_size):
+        collection.update(ids=ids[start:start + chunk_size], metadatas=metadatas[start:start + chunk_size])
+
+def stack_embeddings(ids, found, dimension):
+    return np.stack([found[id_] for id_ in ids]) if ids else np.zeros((0, dimension), dtype=np.float32)
+
+def talent_pool_filter(job=None, ingested_after=None):
+    conditions = []
+    if job:
+        # Untagged entries from before job_key only match on "job"
+        conditions.append({"$or": [{job_key(job): True}, {"job": job}]})
+    if ingested_after is not None:
+        conditions.append({"ingested_at": {"$gte": ingested_after}})
+    if not conditions:
+        return None
+    if len(conditions) == 1:
+        return conditions[0]
+    return {"$and": conditions}
+
+def query_talent_pool(collection, query_embedding, k=50, where=None):
+    # Approximate nearest-neighbour lookup over every stored resume. Returns dicts
+    # with id, document, metadata and cosine similarity, best first.
+    k = min(k, collection.count())
+    if k <= 0:
+        return []
+    result = collection.query(
+        query_embeddings=[np.asarray(query_embedding, dtype=np.float32).tolist()],
+        n_results=k,
+        where=where,
+        include=["documents", "metadatas", "distances"],
+    )
+    return [
+        {"id": id_, "document": document, "metadata": metadata or {}, "score": 1.0 - distance}
+        for id_, document, metadata, distance in zip(
+            result["ids"][0], result["documents"][0], result["metadatas"][0], result["distances"][0]
+        )
+    ]
@@ -0,0 +1,43 @@
+import numpy as np
+
+def cosine_scores(query_embedding, embeddings, normalized=True):
+    # Scores every row against the query with a single matrix-vector product.
+    # encode_batched already returns unit vectors; pass normalized=False otherwise.
+    query = np.asarray(query_embedding, dtype=np.float32)
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    if len(matrix) == 0:
+        return np.zeros(0, dtype=np.float32)
+    if not normalized:
+        query = query / max(np.linalg.norm(query), 1e-12)
+        matrix = matrix / np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+    return matrix @ query
+
+def top_k(scores, k=None):
+    # Returns (indices, scores) of the k best rows, best first. argpartition keeps
+    # this O(n) with only the k survivors sorted.
+    scores = np.asarray(scores)
+    if k is None or k >= len(scores):
+        indices = np.argsort(-scores, kind='stable')
+    elif k <= 0:
+        indices = np.zeros(0, dtype=np.int64)
+    else:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        indices = candidates[np.argsort(-scores[candidates], kind='stable')]
+    return indices, scores[indices]
+
+def top_k_rows(scores, k):
+    # Row-wise top_k over a 2-D score matrix: (indices, scores), each (rows, k)
+    scores = np.asarray(scores)
+    k = max(0, min(k, scores.shape[1]))
+    if k == 0:
+        return np.zeros((scores.shape[0], 0), dtype=np.int64), scores[:, :0]
+    if k < scores.shape[1]:
+        candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    order = np.argsort(-candidate_scores, axis=1, kind='stable')
+    return np.take_along_axis(candidates, order, axis=1), np.take_along_axis(candidate_scores, order, axis=1)
+
+def rank(query_embedding, embeddings, k=None, normalized=True):
+    return top_k(cosine_scores(query_embedding, embeddings, normalized), k)
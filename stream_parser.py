@@ -0,0 +1,47 @@
+import json
+
+class CandidateStreamParser:
+    # Pulls each JSON object that is an element of an array out of streamed text
+    # as soon as its closing brace arrives. That covers both a bare
+    # "```json [ {...}, {...} ]```" reply and the structured-output form
+    # {"candidates": [ {...}, {...} ]}. Each character is scanned once, so
+    # parsing stays linear in the length of the stream.
+    def __init__(self):
+        self.stack = []
+        self.in_string = False
+        self.escaped = False
+        self.capture_depth = None
+        self.current = []
+        self.errors = 0
+
+    def feed(self, text):
+        completed = []
+        for char in text:
+            if self.capture_depth is not None:
+                self.current.append(char)
+
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char in '{[':
+                if char == '{' and self.capture_depth is None and self.stack and self.stack[-1] == '[':
+                    self.capture_depth = len(self.stack)
+                    self.current = [char]
+                self.stack.append(char)
+            elif char in '}]':
+                if self.stack:
+                    self.stack.pop()
+                if char == '}' and self.capture_depth == len(self.stack):
+                    try:
+                        completed.append(json.loads("".join(self.current)))
+                    except json.JSONDecodeError:
+                        self.errors += 1
+                    self.capture_depth = None
+                    self.current = []
+        return completed
@@ -0,0 +1,277 @@
+import json
+import os
+import sqlite3
+import threading
+import numpy as np
+from scoring import top_k
+
+DEFAULT_VECTOR_STORE_PATH = "vector_store"
+DEFAULT_DTYPE = "float16"
+DTYPES = {"float16": np.float16, "int8": np.int8}
+SCORE_CHUNK_ROWS = 8192
+SQL_CHUNK_SIZE = 500
+INDEX_FILE = "index.db"
+VECTORS_FILE = "vectors.bin"
+SCALES_FILE = "scales.bin"
+WHERE_OPERATORS = {"$eq": "=", "$ne": "!=", "$gt": ">", "$gte": ">=", "$lt": "<", "$lte": "<="}
+
+def quantize(embeddings, dtype):
+    # Returns (stored rows, per-row scales). int8 rows are scaled so their largest
+    # component maps to 127; float16 rows need no scale.
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    if dtype == "float16":
+        return embeddings.astype(np.float16), None
+    scales = np.maximum(np.abs(embeddings).max(axis=1), 1e-12) / 127.0
+    rows = np.clip(np.rint(embeddings / scales[:, None]), -127, 127).astype(np.int8)
+    return rows, scales.astype(np.float32)
+
+def where_clause(where):
+    # The subset of Chroma's metadata filters talent_pool_filter builds:
+    # {"field": value}, {"field": {"$gte": value}} and "$and"/"$or" lists
+    if "$and" in where or "$or" in where:
+        joiner = " AND " if "$and" in where else " OR "
+        parts = [where_clause(condition) for condition in where.get("$and") or where.get("$or")]
+        return "(" + joiner.join(sql for sql, _ in parts) + ")", [value for _, values in parts for value in values]
+    sql = []
+    values = []
+    for field, condition in where.items():
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+        for operator, value in condition.items():
+            if operator not in WHERE_OPERATORS:
+                raise ValueError(f"Unsupported filter operator {operator}")
+            sql.append(f"json_extract(metadata, ?) {WHERE_OPERATORS[operator]} ?")
+            values += ["$." + field, value]
+    return "(" + " AND ".join(sql) + ")", values
+
+class VectorStore:
+    # A local stand-in for the Chroma "resumes" collection that keeps every
+    # embedding as a float16 (2 bytes per dimension) or int8 (1 byte plus a
+    # float32 scale per row) array in a memory-mapped file, next to an SQLite
+    # index holding each row's id, document and metadata. Queries score the
+    # rows straight off the mapping SCORE_CHUNK_ROWS at a time, so memory use
+    # stays flat however many resumes are stored. It answers the get, upsert,
+    # update, count and query calls resume_store makes, with exact (not
+    # approximate) nearest neighbours.
+    def __init__(self, path=DEFAULT_VECTOR_STORE_PATH, dtype=DEFAULT_DTYPE):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(os.path.join(path, INDEX_FILE), check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        with self.connection:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS vectors ("
+                "row INTEGER PRIMARY KEY, id TEXT NOT NULL UNIQUE, document TEXT, metadata TEXT NOT NULL)"
+            )
+        settings = dict(self.connection.execute("SELECT key, value FROM settings"))
+        # An existing store keeps the dtype it was created with
+        self.dtype = settings.get("dtype", dtype)
+        if self.dtype not in DTYPES:
+            raise ValueError(f"Unknown vector store dtype {self.dtype}; use one of {', '.join(DTYPES)}")
+        self.dimension = int(settings["dimension"]) if "dimension" in settings else None
+        self.rows = self.connection.execute("SELECT COUNT(*) FROM vectors").fetchone()[0]
+        self.vectors = None
+        self.scales = None
+        if self.dimension is not None:
+            self.truncate()
+            self.remap()
+
+    def vectors_path(self):
+        return os.path.join(self.path, VECTORS_FILE)
+
+    def scales_path(self):
+        return os.path.join(self.path, SCALES_FILE)
+
+    def row_bytes(self):
+        return self.dimension * np.dtype(DTYPES[self.dtype]).itemsize
+
+    def truncate(self):
+        # Vectors are written before their index rows are committed, so after a
+        # crash the files can hold rows the index never got; drop them
+        for path, size in ((self.vectors_path(), self.row_bytes()), (self.scales_path(), 4)):
+            if os.path.exists(path) and os.path.getsize(path) > self.rows * size:
+                os.truncate(path, self.rows * size)
+
+    def remap(self):
+        if self.rows == 0:
+            self.vectors = np.zeros((0, self.dimension), dtype=DTYPES[self.dtype])
+            self.scales = np.zeros(0, dtype=np.float32) if self.dtype == "int8" else None
+            return
+        self.vectors = np.memmap(self.vectors_path(), dtype=DTYPES[self.dtype], mode='r',
+                                 shape=(self.rows, self.dimension))
+        if self.dtype == "int8":
+            self.scales = np.memmap(self.scales_path(), dtype=np.float32, mode='r', shape=(self.rows,))
+
+    def count(self):
+        return self.rows
+
+    def nbytes(self):
+        return self.rows * (self.row_bytes() + (4 if self.dtype == "int8" else 0))
+
+    def embeddings(self, rows):
+        # float32 copies of the given rows
+        rows = np.asarray(rows, dtype=np.int64)
+        matrix = self.vectors[rows].astype(np.float32)
+        if self.dtype == "int8":
+            matrix *= self.scales[rows][:, None]
+        return matrix
+
+    def select(self, column, key, values):
+        # {key: column} for the rows whose key is in values, looked up in chunks
+        # so ids never have to be held in memory
+        found = {}
+        for start in range(0, len(values), SQL_CHUNK_SIZE):
+            chunk = values[start:start + SQL_CHUNK_SIZE]
+            found.update(self.connection.execute(
+                f"SELECT {key}, {column} FROM vectors WHERE {key} IN ({', '.join('?' * len(chunk))})", chunk
+            ))
+        return found
+
+    def get(self, ids, include=("embeddings",)):
+        with self.lock:
+            row_of = self.select("row", "id", list(ids))
+            found = [(id_, row_of[id_]) for id_ in ids if id_ in row_of]
+            result = {"ids": [id_ for id_, _ in found]}
+            if "embeddings" in include:
+                result["embeddings"] = self.embeddings([row for _, row in found]) if found else []
+            if "documents" in include or "metadatas" in include:
+                documents, metadatas = self.read_rows([row for _, row in found])
+                result["documents"] = documents
+                result["metadatas"] = metadatas
+            return result
+
+    def upsert(self, ids, embeddings, documents=None, metadatas=None):
+        # Existing ids are overwritten in place, new ones are appended
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        documents = documents if documents is not None else [None] * len(ids)
+        metadatas = metadatas if metadatas is not None else [None] * len(ids)
+        if len(ids) == 0:
+            return
+        with self.lock:
+            if self.dimension is None:
+                self.dimension = embeddings.shape[1]
+                with self.connection:
+                    self.connection.executemany(
+                        "INSERT INTO settings (key, value) VALUES (?, ?)",
+                        [("dtype", self.dtype), ("dimension", str(self.dimension))],
+                    )
+            if embeddings.shape[1] != self.dimension:
+                raise ValueError(f"Embedding dimension {embeddings.shape[1]} does not match the store's {self.dimension}")
+
+            row_of = self.select("row", "id", list(ids))
+            rows = []
+            next_row = self.rows
+            for id_ in ids:
+                if id_ not in row_of:
+                    row_of[id_] = next_row
+                    next_row += 1
+                rows.append(row_of[id_])
+            quantized, scales = quantize(embeddings, self.dtype)
+            self.write(self.vectors_path(), rows, quantized, self.row_bytes())
+            if scales is not None:
+                self.write(self.scales_path(), rows, scales, 4)
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO vectors (row, id, document, metadata) VALUES (?, ?, ?, ?)",
+                    [
+                        (row, id_, document, json.dumps(metadata or {}))
+                        for row, id_, document, metadata in zip(rows, ids, documents, metadatas)
+                    ],
+                )
+            self.rows = next_row
+            self.remap()
+
+    def update(self, ids, metadatas):
+        # Replaces the metadata of ids already in the store; unknown ids are skipped
+        with self.lock, self.connection:
+            self.connection.executemany(
+                "UPDATE vectors SET metadata = ? WHERE id = ?",
+                [(json.dumps(metadata or {}), id_) for id_, metadata in zip(ids, metadatas)],
+            )
+
+    def write(self, path, rows, values, size):
+        # New rows go out in one write at the end; overwritten rows are seeked to.
+        # A row repeated within one upsert is written once per occurrence, last wins.
+        with open(path, 'r+b' if os.path.exists(path) else 'w+b') as file:
+            appended = {}
+            for row, value in zip(rows, values):
+                if row < self.rows:
+                    file.seek(row * size)
+                    file.write(value.tobytes())
+                else:
+                    appended[row] = value
+            if appended:
+                file.seek(self.rows * size)
+                file.write(np.ascontiguousarray([appended[row] for row in sorted(appended)]).tobytes())
+
+    def read_rows(self, rows):
+        documents = self.select("document", "row", rows)
+        metadatas = self.select("metadata", "row", rows)
+        return [documents[row] for row in rows], [json.loads(metadatas[row]) for row in rows]
+
+    def search(self, query_embedding, k, where=None):
+        # Returns (rows, cosine scores) of the k best matches, best first. Rows are
+        # scored a chunk at a time and only each chunk's top k are kept.
+        query = np.asarray(query_embedding, dtype=np.float32)
+        with self.lock:
+            if self.rows == 0 or k <= 0:
+                return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+            vectors, scales, total = self.vectors, self.scales, self.rows
+            if where:
+                sql, values = where_clause(where)
+                candidates = np.fromiter(
+                    (row for (row,) in self.connection.execute(f"SELECT row FROM vectors WHERE {sql} ORDER BY row", values)),
+                    dtype=np.int64,
+                )
+                total = len(candidates)
+            else:
+                candidates = None
+        best_rows = np.zeros(0, dtype=np.int64)
+        best_scores = np.zeros(0, dtype=np.float32)
+        for start in range(0, total, SCORE_CHUNK_ROWS):
+            if candidates is None:
+                rows = np.arange(start, min(start + SCORE_CHUNK_ROWS, total))
+                chunk = vectors[start:start + SCORE_CHUNK_ROWS]
+            else:
+                rows = candidates[start:start + SCORE_CHUNK_ROWS]
+                chunk = vectors[rows]
+            scores = chunk.astype(np.float32) @ query
+            if scales is not None:
+                scores *= scales[rows]
+            rows = np.concatenate([best_rows, rows])
+            scores = np.concatenate([best_scores, scores])
+            keep, best_scores = top_k(scores, k)
+            best_rows = rows[keep]
+        return best_rows, best_scores
+
+    def query(self, query_embeddings, n_results=10, where=None, include=("documents", "metadatas", "distances")):
+        result = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        for query_embedding in query_embeddings:
+            rows, scores = self.search(query_embedding, n_results, where)
+            rows = rows.tolist()
+            with self.lock:
+                documents, metadatas = self.read_rows(rows)
+                ids = self.select("id", "row", rows)
+            result["ids"].append([ids[row] for row in rows])
+            result["documents"].append(documents)
+            result["metadatas"].append(metadatas)
+            result["distances"].append((1.0 - scores).tolist())
+        return result
+
+    def close(self):
+        self.vectors = None
+        self.scales = None
+        self.connection.close()
+
+def recall_at_k(store, embeddings, queries, k=10):
+    # Fraction of the exact float32 top k (rows of embeddings, in the order they
+    # were upserted into store) that the store's quantized search also returns
+    exact = np.asarray(embeddings, dtype=np.float32)
+    hits = 0
+    for query in queries:
+        expected, _ = top_k(exact @ np.asarray(query, dtype=np.float32), k)
+        found, _ = store.search(query, k)
+        hits += len(set(expected.tolist()) & set(found.tolist()))
+    return hits / max(1, len(queries) * min(k, len(exact)))
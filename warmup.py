@@ -0,0 +1,72 @@
+import threading
+import time
+from contextlib import contextmanager
+
+class Warmup:
+    # Loads slow resources (models, API clients) on background threads so the
+    # window can open straight away. get() blocks until the resource is loaded.
+    def __init__(self):
+        self.resources = {}
+        self.errors = {}
+        self.timings = {}
+        self.loaded = {}
+        self.listeners = []
+        self.notified = False
+        self.lock = threading.Lock()
+        self.threads = []
+
+    def add(self, name, loader):
+        self.loaded[name] = threading.Event()
+        self.threads.append(threading.Thread(target=self.load, args=(name, loader), daemon=True))
+        return self
+
+    def start(self):
+        for thread in self.threads:
+            thread.start()
+        return self
+
+    def load(self, name, loader):
+        try:
+            with self.timed(name):
+                self.resources[name] = loader()
+        except Exception as e:
+            print(f"Failed to load {name}: {e}")
+            self.errors[name] = e
+        self.loaded[name].set()
+
+        with self.lock:
+            listeners = []
+            if self.is_ready() and not self.notified:
+                self.notified = True
+                listeners = self.listeners
+        for listener in listeners:
+            listener()
+
+    @contextmanager
+    def timed(self, label):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[label] = time.perf_counter() - start
+
+    def is_ready(self):
+        return all(event.is_set() for event in self.loaded.values())
+
+    def on_ready(self, listener):
+        with self.lock:
+            notified = self.notified
+            if not notified:
+                self.listeners.append(listener)
+        if notified:
+            listener()
+
+    def get(self, name, timeout=None):
+        if not self.loaded[name].wait(timeout):
+            raise TimeoutError(f"{name} is still loading")
+        if name in self.errors:
+            raise RuntimeError(f"{name} failed to load: {self.errors[name]}")
+        return self.resources[name]
+
+    def timing_summary(self):
+        return ", ".join(f"{label} {seconds:.2f}s" for label, seconds in self.timings.items())
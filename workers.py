@@ -0,0 +1,57 @@
+import threading
+import traceback
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+class Cancelled(Exception):
+    pass
+
+class WorkerSignals(QObject):
+    progress = pyqtSignal(str, int, int)  # stage, done, total (0 when unknown)
+    partial = pyqtSignal(object)  # an intermediate result, e.g. one streamed candidate
+    metrics = pyqtSignal(str)  # a one-line timing summary of the run so far
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+class Worker(QRunnable):
+    # Runs fn(worker, *args) on the global thread pool. fn must not touch widgets;
+    # it reports back through worker.report() and should call
+    # worker.check_cancelled() between steps so cancel() takes effect.
+    def __init__(self, fn, *args):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.signals = WorkerSignals()
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def is_cancelled(self):
+        return self.cancel_event.is_set()
+
+    def check_cancelled(self):
+        if self.cancel_event.is_set():
+            raise Cancelled()
+
+    def report(self, stage, done=0, total=0):
+        self.check_cancelled()
+        self.signals.progress.emit(stage, done, total)
+
+    def publish(self, item):
+        self.signals.partial.emit(item)
+
+    def run(self):
+        try:
+            result = self.fn(self, *self.args)
+        except Cancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            traceback.print_exc()
+            self.signals.failed.emit(f"{type(e).__name__}: {e}")
+        else:
+            self.signals.finished.emit(result)
+
+    def start(self):
+        QThreadPool.globalInstance().start(self)
+        return self